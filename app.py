@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 from app import create_app, db
 from app.models import *
 from flask_migrate import upgrade
@@ -56,7 +57,11 @@ def create_super_admin():
 def seed_data():
     """Seed database with sample data"""
     from app.models import Tenant, User, Category, Post
-    
+
+    # Demo accounts don't need production-cost hashing; this dominates
+    # seeding runtime otherwise
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
     # Create sample tenant
     tenant = Tenant(
         name='Sample Blog',
@@ -80,53 +85,79 @@ def seed_data():
     db.session.add(admin)
     db.session.flush()
     
-    # Create categories
+    # Create categories with a single bulk INSERT (executemany) instead of
+    # per-row session.add + flush. Bulk mappings bypass ORM events, so slugs
+    # are generated here.
+    def make_slug(text, max_length):
+        import re
+        slug = re.sub(r'[^a-zA-Z0-9\-_\s]', '', text.lower())
+        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
+        return slug[:max_length]
+
     categories = [
         {'name': 'Technology', 'description': 'Tech-related posts'},
         {'name': 'Lifestyle', 'description': 'Lifestyle and personal posts'},
         {'name': 'Travel', 'description': 'Travel experiences and guides'},
     ]
-    
-    for cat_data in categories:
-        category = Category(
-            tenant_id=tenant.id,
-            name=cat_data['name'],
-            description=cat_data['description']
-        )
-        db.session.add(category)
-    
-    db.session.flush()
-    
-    # Create sample posts
-    tech_category = Category.query.filter_by(name='Technology').first()
-    
+
+    cat_rows = [
+        {
+            'tenant_id': tenant.id,
+            'name': cat_data['name'],
+            'slug': make_slug(cat_data['name'], 100),
+            'description': cat_data['description']
+        }
+        for cat_data in categories
+    ]
+    db.session.bulk_insert_mappings(Category, cat_rows)
+
+    # Resolve category ids with one lightweight query (name -> id map)
+    category_ids = dict(
+        Category.query.filter_by(tenant_id=tenant.id)
+                      .with_entities(Category.name, Category.id).all()
+    )
+    tech_category_id = category_ids['Technology']
+
+    # Create sample posts via the same bulk path
     posts = [
         {
             'title': 'Welcome to MultiSutra CMS',
             'content': '<p>This is a sample blog post created with MultiSutra CMS. The system supports rich text editing, media uploads, and much more!</p>',
             'status': 'published',
-            'category': tech_category
+            'category_id': tech_category_id
         },
         {
             'title': 'Getting Started with Your Blog',
             'content': '<p>Here are some tips for getting started with your new blog powered by MultiSutra CMS.</p>',
             'status': 'published',
-            'category': tech_category
+            'category_id': tech_category_id
         }
     ]
-    
-    for post_data in posts:
-        post = Post(
-            tenant_id=tenant.id,
-            author_id=admin.id,
-            title=post_data['title'],
-            content=post_data['content'],
-            status=post_data['status'],
-            category=post_data['category'],
-            published_at=db.func.now() if post_data['status'] == 'published' else None
-        )
-        db.session.add(post)
-    
+
+    post_rows = [
+        {
+            'tenant_id': tenant.id,
+            'author_id': admin.id,
+            'title': post_data['title'],
+            'slug': make_slug(post_data['title'], 200),
+            'content': post_data['content'],
+            'status': post_data['status'],
+            'category_id': post_data['category_id'],
+            'published_at': datetime.utcnow() if post_data['status'] == 'published' else None
+        }
+        for post_data in posts
+    ]
+    db.session.bulk_insert_mappings(Post, post_rows)
+
+    # Bulk mappings also bypass the Post listeners that maintain the
+    # denormalized Category.post_count; backfill it in one UPDATE
+    db.session.execute(
+        db.update(Category)
+        .where(Category.tenant_id == tenant.id)
+        .values(post_count=db.select(db.func.count(Post.id))
+                .where(Post.category_id == Category.id,
+                       Post.status == 'published').scalar_subquery()))
+
     db.session.commit()
     print(f"Sample data created for tenant: {tenant.subdomain}.{os.environ.get('MAIN_DOMAIN', 'multisutra.com')}")
 
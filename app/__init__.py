@@ -6,6 +6,7 @@ from flask_caching import Cache
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_migrate import Migrate
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 # Initialize extensions
@@ -16,6 +17,19 @@ cache = Cache()
 limiter = Limiter(key_func=get_remote_address)
 migrate = Migrate()
 
+_upload_dir_ready = False
+
+def _ensure_upload_dir(app):
+    """Create the upload folder once, on first use"""
+    global _upload_dir_ready
+    if _upload_dir_ready:
+        return
+    from pathlib import Path
+    path = Path(app.config['UPLOAD_FOLDER'])
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    _upload_dir_ready = True
+
 def create_app(config_name='default'):
     """Application factory pattern"""
     
@@ -33,7 +47,23 @@ def create_app(config_name='default'):
     mail.init_app(app)
     cache.init_app(app)
     limiter.init_app(app)
-    
+
+    # Compress sizeable HTML/JSON responses (optional; post payloads
+    # with full content bodies shrink several-fold under brotli)
+    try:
+        from flask_compress import Compress
+        Compress(app)
+    except ImportError:
+        print("Warning: flask-compress not installed, skipping response compression")
+
+    # Bounded pool for password hashing. PBKDF2 spends its time inside
+    # hashlib's C loop with the GIL released, so verifying on a pool
+    # thread lets threaded workers keep serving requests while a login
+    # grinds through its iterations.
+    app.hash_pool = ThreadPoolExecutor(
+        max_workers=os.cpu_count() or 2, thread_name_prefix='pwhash'
+    )
+
     # Configure Flask-Login
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -43,11 +73,41 @@ def create_app(config_name='default'):
     @login_manager.user_loader
     def load_user(user_id):
         from app.models import User
-        return User.query.get(int(user_id))
-    
-    # Create upload directories
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    
+        from sqlalchemy.orm.session import make_transient_to_detached
+
+        # Avoid a User SELECT on every authenticated request by caching the
+        # core fields; the cached copy is re-attached to the session so
+        # profile updates still persist (other attributes load lazily).
+        cache_key = f'user:{user_id}'
+        fields = cache.get(cache_key)
+        if fields is not None:
+            user = User(**fields)
+            make_transient_to_detached(user)
+            db.session.add(user)
+            return user
+
+        user = db.session.get(User, int(user_id))
+        if user is not None:
+            cache.set(cache_key, {
+                'id': user.id,
+                'tenant_id': user.tenant_id,
+                'email': user.email,
+                'username': user.username,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'password_hash': user.password_hash,
+                'role': user.role,
+                'is_active': user.is_active,
+            }, timeout=600)
+        return user
+    
+    # Create upload directories lazily on first request rather than paying
+    # the syscalls at every worker boot
+    @app.before_request
+    def _init_upload_dir():
+        _ensure_upload_dir(app)
+
+
     # Register blueprints
     register_blueprints(app)
     
@@ -59,38 +119,88 @@ def create_app(config_name='default'):
     
     return app
 
+# Modular blueprints and their URL prefixes
+BLUEPRINT_MODULES = {
+    'blog': None,
+    'auth': '/auth',
+    'dashboard': '/dashboard',
+    'media': '/media',
+}
+
 def register_blueprints(app):
     """Register application blueprints"""
-    
-    # Register modular blueprints
-    from app.modules.blog import blog_module
-    app.register_blueprint(blog_module.blueprint)
-    
-    from app.modules.auth import auth_module
-    app.register_blueprint(auth_module.blueprint, url_prefix='/auth')
-    
-    from app.modules.dashboard import dashboard_module
-    app.register_blueprint(dashboard_module.blueprint, url_prefix='/dashboard')
-    
-    from app.modules.media import media_module
-    app.register_blueprint(media_module.blueprint, url_prefix='/media')
+    import importlib
+
+    # Import lazily so workers configured for a subset of the app (via
+    # ENABLED_BLUEPRINTS) never pay the import cost of the others
+    enabled = app.config.get('ENABLED_BLUEPRINTS') or BLUEPRINT_MODULES.keys()
+
+    for name in enabled:
+        module = importlib.import_module(f'app.modules.{name}')
+        blueprint = getattr(module, f'{name}_module').blueprint
+        app.register_blueprint(blueprint, url_prefix=BLUEPRINT_MODULES[name])
+
+@cache.memoize(timeout=300)
+def _load_tenant_globals(tenant_id):
+    """Load the settings dict and nav categories for a tenant in one pass
+
+    Bundled into one cache entry so the warm path is a single cache GET
+    per request and a cold miss fetches both together.
+    """
+    from sqlalchemy import select
+    from app.models import Setting, Category
+
+    # Plain Core select returning (key, value) Row tuples - no ORM
+    # instrumentation or identity-map bookkeeping for a trivial k/v dict
+    settings_stmt = select(Setting.key, Setting.value)
+    categories_query = Category.query.filter_by(is_active=True)
+    if tenant_id is not None:
+        settings_stmt = settings_stmt.filter_by(tenant_id=tenant_id)
+        categories_query = categories_query.filter_by(tenant_id=tenant_id)
+
+    settings = dict(db.session.execute(settings_stmt).all())
+    categories = categories_query.order_by(Category.sort_order).limit(10).all()
+    return settings, categories
+
+def invalidate_tenant_globals(tenant_id=None):
+    """Drop the cached settings/categories after a write"""
+    from flask_caching import make_template_fragment_key
+
+    if tenant_id is not None:
+        cache.delete_memoized(_load_tenant_globals, tenant_id)
+        cache.delete(make_template_fragment_key('nav_categories', vary_on=[str(tenant_id)]))
+        cache.delete(f'categories:{tenant_id}')
+    else:
+        cache.delete_memoized(_load_tenant_globals)
+
+def posts_cache_version(tenant_id):
+    """Current version component for cached post-list responses"""
+    return cache.get(f'posts_ver:{tenant_id}') or 0
+
+def invalidate_post_lists(tenant_id):
+    """Invalidate cached post-list responses for a tenant
+
+    Cache backends can't delete posts:<tenant>:* by pattern, so the
+    version embedded in the keys is bumped instead and the stale
+    entries age out with their TTL.
+    """
+    cache.set(f'posts_ver:{tenant_id}', posts_cache_version(tenant_id) + 1)
 
 def register_context_processors(app):
     """Register template context processors"""
-    
+
     @app.context_processor
     def inject_global_vars():
-        from app.models import Setting, Category, Post
+        from app.models import Post
+        from app.utils.tenant import get_current_tenant
         from flask_login import current_user
-        
-        # Get blog settings
-        settings = {}
-        for setting in Setting.query.all():
-            settings[setting.key] = setting.value
-        
-        # Get active categories for navigation
-        categories = Category.query.filter_by(is_active=True).order_by(Category.sort_order).limit(10).all()
-        
+
+        tenant = get_current_tenant()
+        tenant_id = tenant.id if tenant else None
+
+        # Get blog settings + nav categories (one cached bundle per tenant)
+        settings, categories = _load_tenant_globals(tenant_id)
+
         # Helper functions for templates
         def get_categories():
             return categories
@@ -102,6 +212,7 @@ def register_context_processors(app):
         
         return {
             'blog_settings': settings,
+            'current_tenant': tenant,
             'get_categories': get_categories,
             'get_recent_posts': get_recent_posts,
             'google_analytics_id': app.config.get('GOOGLE_ANALYTICS_ID'),
@@ -109,13 +220,14 @@ def register_context_processors(app):
 
 def register_error_handlers(app):
     """Register error handlers"""
-    
+    from jinja2 import TemplateError
+
     @app.errorhandler(404)
     def not_found_error(error):
         try:
             from flask import render_template
             return render_template('errors/404.html'), 404
-        except:
+        except TemplateError:
             return '<h1>404 - Page Not Found</h1><p><a href="/">Go Home</a></p>', 404
     
     @app.errorhandler(500)
@@ -136,5 +248,5 @@ def register_error_handlers(app):
         try:
             from flask import render_template
             return render_template('errors/403.html'), 403
-        except:
+        except TemplateError:
             return '<h1>403 - Access Forbidden</h1><p><a href="/">Go Home</a></p>', 403
\ No newline at end of file
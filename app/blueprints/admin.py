@@ -1,12 +1,25 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from app.models import Tenant, User, Post, Category, Tag, Setting
-from app import db
+from app import db, cache
+from sqlalchemy import func, case, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash
 import os
 
 bp = Blueprint('admin', __name__)
 
+# Translation table stripping the separators allowed in subdomains
+_SUBDOMAIN_STRIP = str.maketrans('', '', '-_')
+
+# Parsed once at import; before_request runs on every admin hit
+SUPER_ADMIN_EMAILS = frozenset(
+    email.strip().lower()
+    for email in os.environ.get('SUPER_ADMINS', '').split(',')
+    if email.strip()
+)
+
 @bp.before_request
 @login_required
 def before_request():
@@ -14,30 +27,34 @@ def before_request():
     # Check if user is super admin (you might want to implement this differently)
     if not getattr(current_user, 'is_super_admin', False):
         # For now, we'll check if user email is in a list of super admins
-        super_admins = os.environ.get('SUPER_ADMINS', '').split(',')
-        if current_user.email not in super_admins:
+        if current_user.email.lower() not in SUPER_ADMIN_EMAILS:
             flash('Access denied. Super admin privileges required.', 'error')
             return redirect(url_for('main.index'))
 
+@cache.cached(timeout=60, key_prefix='admin_dashboard_stats')
+def _admin_stats():
+    """Get system statistics (cached; counts don't need to be real-time)"""
+    # Both tenant counts come back in a single round-trip
+    total_tenants, active_tenants = db.session.query(
+        func.count(Tenant.id),
+        func.coalesce(func.sum(case((Tenant.is_active, 1), else_=0)), 0)
+    ).one()
+
+    return {
+        'total_tenants': total_tenants,
+        'active_tenants': int(active_tenants),
+        'total_users': db.session.query(func.count(User.id)).scalar(),
+        'total_posts': db.session.query(func.count(Post.id)).scalar()
+    }
+
 @bp.route('/')
 def index():
     """Admin dashboard"""
-    # Get system statistics
-    total_tenants = Tenant.query.count()
-    active_tenants = Tenant.query.filter_by(is_active=True).count()
-    total_users = User.query.count()
-    total_posts = Post.query.count()
-    
     # Get recent tenants
     recent_tenants = Tenant.query.order_by(Tenant.created_at.desc()).limit(5).all()
-    
+
     return render_template('admin/index.html',
-                         stats={
-                             'total_tenants': total_tenants,
-                             'active_tenants': active_tenants,
-                             'total_users': total_users,
-                             'total_posts': total_posts
-                         },
+                         stats=_admin_stats(),
                          recent_tenants=recent_tenants)
 
 @bp.route('/tenants')
@@ -50,22 +67,39 @@ def tenants():
     tenants_query = Tenant.query
     
     if search:
-        tenants_query = tenants_query.filter(
-            db.or_(
-                Tenant.name.contains(search),
-                Tenant.subdomain.contains(search),
-                Tenant.title.contains(search)
+        if db.engine.dialect.name == 'postgresql':
+            # Single ILIKE over the concatenated columns; matches the
+            # trigram index expression so the planner can use it
+            tenants_query = tenants_query.filter(
+                (Tenant.name + ' ' + Tenant.subdomain + ' '
+                 + func.coalesce(Tenant.title, '')).ilike(f'%{search}%')
+            )
+        else:
+            tenants_query = tenants_query.filter(
+                db.or_(
+                    Tenant.name.contains(search),
+                    Tenant.subdomain.contains(search),
+                    Tenant.title.contains(search)
+                )
             )
-        )
     
     if status == 'active':
         tenants_query = tenants_query.filter_by(is_active=True)
     elif status == 'inactive':
         tenants_query = tenants_query.filter_by(is_active=False)
     
+    # Skip the per-page COUNT(*); cache the total briefly per filter combo
+    count_key = f'admin_tenants_count:{search}:{status}'
+    total = cache.get(count_key)
+    if total is None:
+        total = tenants_query.order_by(None).count()
+        cache.set(count_key, total, timeout=30)
+
     tenants = tenants_query.order_by(Tenant.created_at.desc())\
-                          .paginate(page=page, per_page=20, error_out=False)
-    
+                          .paginate(page=page, per_page=20, error_out=False,
+                                    count=False)
+    tenants.total = total
+
     return render_template('admin/tenants.html',
                          tenants=tenants,
                          search_query=search,
@@ -93,10 +127,10 @@ def new_tenant():
         
         if not subdomain:
             errors.append('Subdomain is required.')
-        elif not subdomain.replace('-', '').replace('_', '').isalnum():
+        elif not subdomain.translate(_SUBDOMAIN_STRIP).isalnum():
             errors.append('Subdomain must contain only letters, numbers, hyphens, and underscores.')
-        elif Tenant.query.filter_by(subdomain=subdomain).first():
-            errors.append('Subdomain is already taken.')
+        elif not 3 <= len(subdomain) <= 63:
+            errors.append('Subdomain must be between 3 and 63 characters long.')
         
         if not admin_email or '@' not in admin_email:
             errors.append('Valid admin email is required.')
@@ -138,7 +172,12 @@ def new_tenant():
             
             flash(f'Tenant "{name}" created successfully!', 'success')
             return redirect(url_for('admin.tenants'))
-            
+
+        except IntegrityError:
+            # The unique index on Tenant.subdomain is the source of truth;
+            # no racy pre-check SELECT needed
+            db.session.rollback()
+            flash('Subdomain is already taken.', 'error')
         except Exception as e:
             db.session.rollback()
             flash(f'Error creating tenant: {str(e)}', 'error')
@@ -148,18 +187,25 @@ def new_tenant():
 @bp.route('/tenants/<int:id>')
 def tenant_detail(id):
     """View tenant details"""
-    tenant = Tenant.query.get_or_404(id)
+    tenant = db.get_or_404(Tenant, id)
     
-    # Get tenant statistics
-    user_count = User.query.filter_by(tenant_id=tenant.id).count()
-    post_count = Post.query.filter_by(tenant_id=tenant.id).count()
-    published_posts = Post.query.filter_by(tenant_id=tenant.id, status='published').count()
+    # Get tenant statistics in a single round-trip via scalar subqueries
+    user_count, post_count, published_posts = db.session.execute(select(
+        select(func.count(User.id))
+            .where(User.tenant_id == tenant.id).scalar_subquery(),
+        select(func.count(Post.id))
+            .where(Post.tenant_id == tenant.id).scalar_subquery(),
+        select(func.count(Post.id))
+            .where(Post.tenant_id == tenant.id, Post.status == 'published')
+            .scalar_subquery()
+    )).one()
     
     # Get recent users and posts
     recent_users = User.query.filter_by(tenant_id=tenant.id)\
                             .order_by(User.created_at.desc()).limit(5).all()
     
-    recent_posts = Post.query.filter_by(tenant_id=tenant.id)\
+    recent_posts = Post.query.options(joinedload(Post.author))\
+                            .filter_by(tenant_id=tenant.id)\
                             .order_by(Post.created_at.desc()).limit(5).all()
     
     return render_template('admin/tenant_detail.html',
@@ -175,7 +221,7 @@ def tenant_detail(id):
 @bp.route('/tenants/<int:id>/edit', methods=['GET', 'POST'])
 def edit_tenant(id):
     """Edit tenant"""
-    tenant = Tenant.query.get_or_404(id)
+    tenant = db.get_or_404(Tenant, id)
     
     if request.method == 'POST':
         tenant.name = request.form.get('name', '').strip()
@@ -209,7 +255,7 @@ def edit_tenant(id):
 @bp.route('/tenants/<int:id>/toggle-status', methods=['POST'])
 def toggle_tenant_status(id):
     """Toggle tenant active status"""
-    tenant = Tenant.query.get_or_404(id)
+    tenant = db.get_or_404(Tenant, id)
     
     tenant.is_active = not tenant.is_active
     db.session.commit()
@@ -222,7 +268,7 @@ def toggle_tenant_status(id):
 @bp.route('/tenants/<int:id>/delete', methods=['POST'])
 def delete_tenant(id):
     """Delete tenant (dangerous operation)"""
-    tenant = Tenant.query.get_or_404(id)
+    tenant = db.get_or_404(Tenant, id)
     
     # Get confirmation
     if request.form.get('confirm_name') != tenant.name:
@@ -252,7 +298,8 @@ def users():
     tenant_id = request.args.get('tenant', type=int)
     role = request.args.get('role')
     
-    users_query = User.query.join(Tenant)
+    # Eager-load the tenant so the listing template doesn't lazy-load it per row
+    users_query = User.query.options(joinedload(User.tenant))
     
     if search:
         users_query = users_query.filter(
@@ -270,9 +317,18 @@ def users():
     if role:
         users_query = users_query.filter_by(role=role)
     
+    # Skip the per-page COUNT(*); cache the total briefly per filter combo
+    count_key = f'admin_users_count:{search}:{tenant_id}:{role}'
+    total = cache.get(count_key)
+    if total is None:
+        total = users_query.order_by(None).count()
+        cache.set(count_key, total, timeout=30)
+
     users = users_query.order_by(User.created_at.desc())\
-                      .paginate(page=page, per_page=20, error_out=False)
-    
+                      .paginate(page=page, per_page=20, error_out=False,
+                                count=False)
+    users.total = total
+
     # Get tenants for filter
     tenants = Tenant.query.filter_by(is_active=True).order_by(Tenant.name).all()
     
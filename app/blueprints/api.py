@@ -1,11 +1,73 @@
-from flask import Blueprint, jsonify, request
+import hashlib
+
+from flask import Blueprint, jsonify, request, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import selectinload, raiseload
 from app.models import Post, Category, Tag, MediaFile, Comment, User
 from app.utils.tenant import get_current_tenant, tenant_required
-from app import db
+from app import db, cache, posts_cache_version, invalidate_post_lists
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 bp = Blueprint('api', __name__)
 
+def _json_response(payload):
+    """Serialize a payload with orjson when it's installed
+
+    orjson's C encoder is several times faster than stdlib json on the
+    nested dicts the posts endpoints return; without it this falls back
+    to jsonify.
+    """
+    if orjson is not None:
+        return current_app.response_class(
+            orjson.dumps(payload), mimetype='application/json')
+    return jsonify(payload)
+
+def _with_etag(resp):
+    """Tag a response with a content hash and honor If-None-Match
+
+    Repeat polls with a matching ETag get an empty 304 instead of the
+    full body.
+    """
+    resp.set_etag(hashlib.md5(resp.get_data()).hexdigest())
+    return resp.make_conditional(request)
+
+def _tenant_total_views(tenant_id):
+    """O(1) per-tenant view total, seeded from the DB on a cache miss
+
+    Post.increment_view_count bumps the counter on every view; after a
+    cold start or eviction the counter is reconciled from the
+    authoritative per-post sum.
+    """
+    key = f'tenant_views:{tenant_id}'
+    total = cache.get(key)
+    if total is None:
+        total = db.session.query(db.func.sum(Post.view_count))\
+                          .filter(Post.tenant_id == tenant_id).scalar() or 0
+        cache.set(key, int(total), timeout=0)
+    return int(total)
+
+def _post_load_options():
+    """Loader options for routes that serialize posts via to_dict()
+
+    to_dict() touches author, category and tags; without eager loading
+    each one fires a lazy SELECT per row. Under STRICT_LOADING,
+    raiseload('*') turns any relation we forgot to list here into a
+    hard error instead of a silent N+1.
+    """
+    options = [
+        selectinload(Post.author),
+        selectinload(Post.category),
+        selectinload(Post.tags),
+    ]
+    if current_app.config.get('STRICT_LOADING'):
+        options.append(raiseload('*'))
+    return options
+
 @bp.before_request
 @login_required
 @tenant_required
@@ -22,47 +84,93 @@ def get_posts():
     status = request.args.get('status', 'published')
     limit = min(request.args.get('limit', 10, type=int), 100)
     offset = request.args.get('offset', 0, type=int)
-    
-    posts_query = Post.for_tenant().filter_by(status=status)\
-                     .order_by(Post.published_at.desc())
-    
-    posts = posts_query.offset(offset).limit(limit).all()
-    total = posts_query.count()
-    
-    return jsonify({
+
+    # Identical params produce identical JSON between writes, so serve
+    # the whole payload from cache on the hot path
+    cache_key = (f'posts:{tenant.id}:{posts_cache_version(tenant.id)}:'
+                 f'{status}:{limit}:{offset}')
+
+    # The cache key already changes whenever the result set can change
+    # (version bump on writes), so it doubles as a strong ETag and a
+    # match skips serialization entirely
+    etag = hashlib.md5(cache_key.encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        return '', 304
+
+    payload = cache.get(cache_key)
+    if payload is not None:
+        resp = _json_response(payload)
+        resp.set_etag(etag)
+        return resp
+
+    # COUNT(*) OVER () returns the total alongside the page rows, so one
+    # query replaces the page SELECT + separate count() scan
+    stmt = select(Post, func.count().over().label('total'))\
+        .options(*_post_load_options())\
+        .where(Post.tenant_id == tenant.id, Post.status == status)\
+        .order_by(Post.published_at.desc())\
+        .offset(offset).limit(limit)
+
+    rows = db.session.execute(stmt).all()
+    posts = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Past-the-end page: the window count comes back with no rows,
+        # but clients still page off the true total
+        total = db.session.scalar(
+            select(func.count()).select_from(Post)
+            .where(Post.tenant_id == tenant.id, Post.status == status))
+    else:
+        total = 0
+
+    # Embedded Tag.to_dict would otherwise COUNT per (post, tag) pair
+    Tag.attach_post_counts({tag for post in posts for tag in post.tags})
+
+    payload = {
         'posts': [post.to_dict() for post in posts],
         'total': total,
         'limit': limit,
         'offset': offset
-    })
+    }
+    cache.set(cache_key, payload, timeout=60)
+
+    resp = _json_response(payload)
+    resp.set_etag(etag)
+    return resp
 
 @bp.route('/posts/<int:id>')
 def get_post(id):
     """Get single post API"""
     tenant = get_current_tenant()
     
-    post = Post.for_tenant().filter_by(id=id).first()
-    
-    if not post:
+    # PK get hits the session identity map for free on repeat lookups;
+    # the tenant check moves to Python since get() bypasses for_tenant()
+    post = db.session.get(Post, id, options=_post_load_options())
+
+    if not post or post.tenant_id != tenant.id:
         return jsonify({'error': 'Post not found'}), 404
-    
+
     # Check permissions
     if post.status != 'published' and not current_user.can_edit_post(post):
         return jsonify({'error': 'Post not found'}), 404
-    
-    return jsonify({'post': post.to_dict()})
+
+    # Embedded Tag.to_dict would otherwise COUNT per tag
+    Tag.attach_post_counts(post.tags)
+
+    return _with_etag(_json_response({'post': post.to_dict()}))
 
 @bp.route('/categories')
 def get_categories():
     """Get categories API"""
     tenant = get_current_tenant()
-    
-    categories = Category.for_tenant().filter_by(is_active=True)\
-                        .order_by(Category.sort_order, Category.name).all()
-    
-    return jsonify({
-        'categories': [category.to_dict() for category in categories]
-    })
+
+    # Categories change rarely; the helper caches the serialized list
+    # per tenant (invalidate_tenant_globals drops it on category writes)
+    from app.utils.helpers import active_categories
+    payload = {'categories': active_categories(tenant.id)}
+
+    return _with_etag(_json_response(payload))
 
 @bp.route('/tags')
 def get_tags():
@@ -74,16 +182,23 @@ def get_tags():
     limit = min(request.args.get('limit', 20, type=int), 100)
     
     tags_query = Tag.for_tenant()
-    
+
     if search:
-        tags_query = tags_query.filter(Tag.name.contains(search))
+        # Anchored prefix match on lower(name) so the planner can use the
+        # tags_name_prefix index instead of scanning for LIKE '%q%'
+        tags_query = tags_query.filter(
+            func.lower(Tag.name).like(search.lower() + '%')
+        )
     
     tags = tags_query.order_by(Tag.use_count.desc(), Tag.name)\
                     .limit(limit).all()
-    
-    return jsonify({
+
+    # One grouped query instead of a COUNT per serialized tag
+    Tag.attach_post_counts(tags)
+
+    return _with_etag(_json_response({
         'tags': [tag.to_dict() for tag in tags]
-    })
+    }))
 
 @bp.route('/media')
 def get_media():
@@ -94,16 +209,30 @@ def get_media():
     limit = min(request.args.get('limit', 20, type=int), 100)
     offset = request.args.get('offset', 0, type=int)
     
-    media_query = MediaFile.for_tenant()
-    
+    # Same windowed-count trick as get_posts: page + total in one query
+    stmt = select(MediaFile, func.count().over().label('total'))\
+        .where(MediaFile.tenant_id == tenant.id)
+
     if file_type:
-        media_query = media_query.filter_by(file_type=file_type)
-    
-    media_files = media_query.order_by(MediaFile.created_at.desc())\
-                            .offset(offset).limit(limit).all()
-    
-    total = media_query.count()
-    
+        stmt = stmt.where(MediaFile.file_type == file_type)
+
+    stmt = stmt.order_by(MediaFile.created_at.desc())\
+               .offset(offset).limit(limit)
+
+    rows = db.session.execute(stmt).all()
+    media_files = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Past-the-end page: fall back to a plain COUNT for the filter
+        count_stmt = select(func.count()).select_from(MediaFile)\
+            .where(MediaFile.tenant_id == tenant.id)
+        if file_type:
+            count_stmt = count_stmt.where(MediaFile.file_type == file_type)
+        total = db.session.scalar(count_stmt)
+    else:
+        total = 0
+
     return jsonify({
         'media_files': [media.to_dict() for media in media_files],
         'total': total,
@@ -116,51 +245,79 @@ def search():
     """Search API"""
     tenant = get_current_tenant()
     
-    query = request.args.get('q', '').strip()
+    # Normalize once: collapse whitespace and lowercase, so trivially
+    # different spellings of the same query share one cache entry
+    query = ' '.join(request.args.get('q', '').split()).lower()
     content_type = request.args.get('type', 'posts')  # posts, categories, tags
     limit = min(request.args.get('limit', 10, type=int), 50)
-    
-    if not query:
+
+    # Single-character queries would match most of the table; refuse
+    # them before touching the database
+    if len(query) < 2:
         return jsonify({'results': [], 'total': 0})
-    
+
+    cache_key = f'search:{tenant.id}:{content_type}:{query}:{limit}'
+    payload = cache.get(cache_key)
+    if payload is not None:
+        return _json_response(payload)
+
     results = []
     total = 0
-    
+
     if content_type == 'posts':
-        posts = Post.for_tenant().filter(
-            db.or_(
-                Post.title.contains(query),
-                Post.content.contains(query)
-            ),
-            Post.status == 'published'
-        ).order_by(Post.published_at.desc()).limit(limit).all()
-        
+        posts_query = Post.for_tenant().options(*_post_load_options())\
+                          .filter(Post.status == 'published')
+
+        if db.engine.dialect.name == 'postgresql':
+            # Full-text search; the expression must match the
+            # posts_search_tsv GIN index so it stays index-backed
+            tsquery = func.plainto_tsquery('english', query)
+            document = func.to_tsvector('english', Post.title + ' ' + Post.content)
+            posts_query = posts_query.filter(document.op('@@')(tsquery))\
+                                     .order_by(func.ts_rank(document, tsquery).desc())
+        else:
+            posts_query = posts_query.filter(
+                db.or_(
+                    Post.title.contains(query),
+                    Post.content.contains(query)
+                )
+            ).order_by(Post.published_at.desc())
+
+        posts = posts_query.limit(limit).all()
+
+        # Embedded Tag.to_dict would otherwise COUNT per (post, tag) pair
+        Tag.attach_post_counts({tag for post in posts for tag in post.tags})
+
         results = [post.to_dict() for post in posts]
         total = len(results)
-        
+
     elif content_type == 'categories':
         categories = Category.for_tenant().filter(
-            Category.name.contains(query),
+            func.lower(Category.name).like(query.lower() + '%'),
             Category.is_active == True
         ).order_by(Category.name).limit(limit).all()
-        
+
         results = [category.to_dict() for category in categories]
         total = len(results)
-        
+
     elif content_type == 'tags':
         tags = Tag.for_tenant().filter(
-            Tag.name.contains(query)
+            func.lower(Tag.name).like(query.lower() + '%')
         ).order_by(Tag.use_count.desc(), Tag.name).limit(limit).all()
-        
+
+        Tag.attach_post_counts(tags)
         results = [tag.to_dict() for tag in tags]
         total = len(results)
     
-    return jsonify({
+    payload = {
         'results': results,
         'total': total,
         'query': query,
         'type': content_type
-    })
+    }
+    cache.set(cache_key, payload, timeout=60)
+
+    return _json_response(payload)
 
 @bp.route('/stats')
 def get_stats():
@@ -170,7 +327,14 @@ def get_stats():
     # Only admins can view detailed stats
     if not current_user.is_admin():
         return jsonify({'error': 'Permission denied'}), 403
-    
+
+    # Serve from cache; ~11 COUNT/SUM round-trips otherwise, and the
+    # numbers don't need to be real-time
+    cache_key = f'stats:{tenant.id}'
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return jsonify({'stats': stats})
+
     # Get various statistics
     stats = {
         'posts': {
@@ -188,12 +352,40 @@ def get_stats():
             'pending': Comment.for_tenant().filter_by(status='pending').count(),
         },
         'users': User.for_tenant().count(),
-        'total_views': db.session.query(db.func.sum(Post.view_count))\
-                                .filter(Post.tenant_id == tenant.id).scalar() or 0
+        'total_views': _tenant_total_views(tenant.id)
     }
-    
+    cache.set(cache_key, stats, timeout=60)
+
     return jsonify({'stats': stats})
 
+@bp.route('/posts/toggle-featured', methods=['POST'])
+def toggle_posts_featured():
+    """Toggle featured status for a batch of posts"""
+    tenant = get_current_tenant()
+
+    if not current_user.is_admin():
+        return jsonify({'error': 'Permission denied'}), 403
+
+    data = request.get_json(silent=True) or {}
+    ids = [id for id in data.get('ids', []) if isinstance(id, int)]
+
+    if not ids:
+        return jsonify({'error': 'No post ids provided'}), 400
+
+    result = db.session.execute(
+        update(Post)
+        .where(Post.id.in_(ids), Post.tenant_id == tenant.id)
+        .values(is_featured=db.not_(Post.is_featured))
+    )
+    db.session.commit()
+    cache.delete(f'stats:{tenant.id}')
+    invalidate_post_lists(tenant.id)
+
+    return jsonify({
+        'success': True,
+        'updated': result.rowcount
+    })
+
 @bp.route('/posts/<int:id>/toggle-featured', methods=['POST'])
 def toggle_post_featured(id):
     """Toggle post featured status"""
@@ -202,60 +394,97 @@ def toggle_post_featured(id):
     if not current_user.is_admin():
         return jsonify({'error': 'Permission denied'}), 403
     
-    post = Post.for_tenant().filter_by(id=id).first()
-    
-    if not post:
+    post = db.session.get(Post, id)
+
+    if not post or post.tenant_id != tenant.id:
         return jsonify({'error': 'Post not found'}), 404
-    
+
     post.is_featured = not post.is_featured
     db.session.commit()
-    
+    cache.delete(f'stats:{tenant.id}')
+    invalidate_post_lists(tenant.id)
+
     return jsonify({
         'success': True,
         'is_featured': post.is_featured,
         'post_id': post.id
     })
 
+def _bulk_update_comments(tenant, ids, status, is_approved):
+    """Moderate a batch of comments with one UPDATE and one commit"""
+    result = db.session.execute(
+        update(Comment)
+        .where(Comment.id.in_(ids), Comment.tenant_id == tenant.id)
+        .values(status=status, is_approved=is_approved)
+    )
+    db.session.commit()
+    cache.delete(f'stats:{tenant.id}')
+    return result.rowcount
+
+def _moderate_comments(status, is_approved):
+    """Shared handler for the bulk approve/spam routes"""
+    tenant = get_current_tenant()
+
+    if not current_user.is_admin():
+        return jsonify({'error': 'Permission denied'}), 403
+
+    data = request.get_json(silent=True) or {}
+    ids = [id for id in data.get('ids', []) if isinstance(id, int)]
+
+    if not ids:
+        return jsonify({'error': 'No comment ids provided'}), 400
+
+    updated = _bulk_update_comments(tenant, ids, status, is_approved)
+
+    return jsonify({
+        'success': True,
+        'updated': updated
+    })
+
+@bp.route('/comments/approve', methods=['POST'])
+def approve_comments():
+    """Approve a batch of comments"""
+    return _moderate_comments('approved', True)
+
+@bp.route('/comments/spam', methods=['POST'])
+def mark_comments_spam():
+    """Mark a batch of comments as spam"""
+    return _moderate_comments('spam', False)
+
 @bp.route('/comments/<int:id>/approve', methods=['POST'])
 def approve_comment(id):
     """Approve comment"""
     tenant = get_current_tenant()
-    
+
     if not current_user.is_admin():
         return jsonify({'error': 'Permission denied'}), 403
-    
-    comment = Comment.for_tenant().filter_by(id=id).first()
-    
-    if not comment:
+
+    updated = _bulk_update_comments(tenant, [id], 'approved', True)
+
+    if not updated:
         return jsonify({'error': 'Comment not found'}), 404
-    
-    comment.approve()
-    db.session.commit()
-    
+
     return jsonify({
         'success': True,
-        'status': comment.status,
-        'comment_id': comment.id
+        'status': 'approved',
+        'comment_id': id
     })
 
 @bp.route('/comments/<int:id>/spam', methods=['POST'])
 def mark_comment_spam(id):
     """Mark comment as spam"""
     tenant = get_current_tenant()
-    
+
     if not current_user.is_admin():
         return jsonify({'error': 'Permission denied'}), 403
-    
-    comment = Comment.for_tenant().filter_by(id=id).first()
-    
-    if not comment:
+
+    updated = _bulk_update_comments(tenant, [id], 'spam', False)
+
+    if not updated:
         return jsonify({'error': 'Comment not found'}), 404
-    
-    comment.mark_as_spam()
-    db.session.commit()
-    
+
     return jsonify({
         'success': True,
-        'status': comment.status,
-        'comment_id': comment.id
+        'status': 'spam',
+        'comment_id': id
     })
\ No newline at end of file
@@ -1,10 +1,13 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import generate_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash
 from app.models import User, Tenant
 from app.forms import LoginForm, RegisterForm, ProfileForm, ChangePasswordForm, ForgotPasswordForm, ResetPasswordForm
 from app.utils.tenant import get_current_tenant, tenant_required
-from app import db
+from app.utils.security import (safe_redirect_target, verify_password_pooled,
+                                complete_login)
+from app import db, cache, limiter
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 
@@ -12,6 +15,9 @@ bp = Blueprint('auth', __name__)
 
 @bp.route('/login', methods=['GET', 'POST'])
 @tenant_required
+# Reject brute-force attempts before they reach the expensive password
+# hash; with Redis storage this is an atomic INCR+EXPIRE per window
+@limiter.limit('10 per minute', methods=['POST'])
 def login():
     """User login"""
     tenant = get_current_tenant()
@@ -25,20 +31,25 @@ def login():
         password = form.password.data
         remember = form.remember_me.data
         
-        # Find user by email or username in current tenant
-        user = User.for_tenant(tenant.id).filter(
-            (User.email == username_or_email) | 
-            (User.username == username_or_email)
-        ).filter_by(is_active=True).first()
+        # Find user by email or username in current tenant; email logins
+        # resolve through the cached id index and skip the SQL lookup
+        user = None
+        if '@' in username_or_email:
+            user = User.get_by_email_cached(tenant.id, username_or_email)
+            if user and not user.is_active:
+                user = None
+        if user is None:
+            user = User.for_tenant(tenant.id).filter(
+                (User.email == username_or_email) |
+                (User.username == username_or_email)
+            ).filter_by(is_active=True).first()
         
-        if user and user.check_password(password):
-            login_user(user, remember=remember)
-            user.last_login = datetime.utcnow()
-            db.session.commit()
-            
+        if user and verify_password_pooled(user, password):
+            complete_login(user, remember=remember, password=password)
+
             # Redirect to next page or dashboard
-            next_page = request.args.get('next')
-            if next_page and next_page.startswith('/'):
+            next_page = safe_redirect_target(request.args.get('next'))
+            if next_page:
                 return redirect(next_page)
             return redirect(url_for('dashboard.index'))
         else:
@@ -105,6 +116,7 @@ def profile():
             user.website_url = 'https://' + user.website_url
         
         db.session.commit()
+        cache.delete(f'user:{user.id}')
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('auth.profile'))
     
@@ -126,6 +138,7 @@ def change_password():
         else:
             user.set_password(form.new_password.data)
             db.session.commit()
+            cache.delete(f'user:{user.id}')
             flash('Password changed successfully!', 'success')
             return redirect(url_for('auth.profile'))
     
@@ -133,6 +146,7 @@ def change_password():
 
 @bp.route('/forgot-password', methods=['GET', 'POST'])
 @tenant_required
+@limiter.limit('10 per minute', methods=['POST'])
 def forgot_password():
     """Forgot password - request reset"""
     tenant = get_current_tenant()
@@ -144,12 +158,15 @@ def forgot_password():
     if form.validate_on_submit():
         email = form.email.data.lower()
         
-        user = User.for_tenant(tenant.id).filter_by(email=email, is_active=True).first()
-        
+        user = User.get_by_email_cached(tenant.id, email)
+        if user and not user.is_active:
+            user = None
+
         if user:
-            # Generate password reset token
+            # Generate password reset token; only its hash hits the DB,
+            # the raw value goes out in the email link
             token = secrets.token_urlsafe(32)
-            user.password_reset_token = token
+            user.password_reset_token_hash = hashlib.sha256(token.encode()).hexdigest()
             user.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
             db.session.commit()
             
@@ -166,6 +183,7 @@ def forgot_password():
 
 @bp.route('/reset-password/<token>', methods=['GET', 'POST'])
 @tenant_required
+@limiter.limit('10 per minute', methods=['POST'])
 def reset_password(token):
     """Reset password with token"""
     tenant = get_current_tenant()
@@ -174,8 +192,9 @@ def reset_password(token):
     if current_user.is_authenticated:
         return redirect(url_for('dashboard.index'))
     
-    # Find user by token
-    user = User.for_tenant(tenant.id).filter_by(password_reset_token=token).first()
+    # Find user by token hash (indexed)
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    user = User.for_tenant(tenant.id).filter_by(password_reset_token_hash=token_hash).first()
     
     if not user or not user.password_reset_expires or user.password_reset_expires < datetime.utcnow():
         flash('Invalid or expired password reset link.', 'error')
@@ -183,9 +202,10 @@ def reset_password(token):
     
     if form.validate_on_submit():
         user.set_password(form.password.data)
-        user.password_reset_token = None
+        user.password_reset_token_hash = None
         user.password_reset_expires = None
         db.session.commit()
+        cache.delete(f'user:{user.id}')
         
         flash('Password has been reset successfully. You can now log in.', 'success')
         return redirect(url_for('auth.login'))
@@ -1,13 +1,21 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, make_response
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from werkzeug.utils import secure_filename
 from app.models import Post, Category, Tag, MediaFile, User, Comment
 from app.utils.tenant import get_current_tenant, tenant_required
-from app import db
+from app.utils.helpers import active_categories, save_upload, sync_post_tags
+from app.utils.pagination import keyset_paginate
+from app import db, cache
 from datetime import datetime
 import os
 from PIL import Image
 
+try:
+    import magic
+except ImportError:
+    magic = None
+
 bp = Blueprint('dashboard', __name__)
 
 @bp.before_request
@@ -21,30 +29,37 @@ def before_request():
 def index():
     """Dashboard homepage"""
     tenant = get_current_tenant()
-    
-    # Get statistics
-    total_posts = Post.for_tenant().count()
-    published_posts = Post.for_tenant().filter_by(status='published').count()
-    draft_posts = Post.for_tenant().filter_by(status='draft').count()
-    total_views = db.session.query(db.func.sum(Post.view_count)).filter(
-        Post.tenant_id == tenant.id).scalar() or 0
-    
-    # Get recent posts
-    recent_posts = Post.for_tenant().order_by(Post.created_at.desc()).limit(5).all()
-    
+
+    # Get statistics: one conditional-aggregation scan instead of three
+    # COUNTs plus a SUM, cached per tenant (Post events invalidate)
+    stats = cache.get(f'dash:stats:{tenant.id}')
+    if stats is None:
+        row = db.session.query(
+            db.func.count(Post.id),
+            db.func.sum(db.case((Post.status == 'published', 1), else_=0)),
+            db.func.sum(db.case((Post.status == 'draft', 1), else_=0)),
+            db.func.coalesce(db.func.sum(Post.view_count), 0),
+        ).filter(Post.tenant_id == tenant.id).one()
+        stats = dict(zip(
+            ('total_posts', 'published_posts', 'draft_posts', 'total_views'),
+            (int(v or 0) for v in row)))
+        cache.set(f'dash:stats:{tenant.id}', stats, timeout=300)
+
+    # Get recent posts (eager-load what the template walks)
+    recent_posts = Post.for_tenant()\
+        .options(joinedload(Post.author), joinedload(Post.category))\
+        .order_by(Post.created_at.desc()).limit(5).all()
+
     # Get recent comments (if user is admin)
     recent_comments = []
     if current_user.is_admin():
-        recent_comments = Comment.for_tenant().order_by(Comment.created_at.desc()).limit(5).all()
+        recent_comments = Comment.for_tenant()\
+            .options(joinedload(Comment.author), joinedload(Comment.post))\
+            .order_by(Comment.created_at.desc()).limit(5).all()
     
     return render_template('dashboard/index.html',
                          tenant=tenant,
-                         stats={
-                             'total_posts': total_posts,
-                             'published_posts': published_posts,
-                             'draft_posts': draft_posts,
-                             'total_views': total_views
-                         },
+                         stats=stats,
                          recent_posts=recent_posts,
                          recent_comments=recent_comments)
 
@@ -72,16 +87,28 @@ def posts():
     search = request.args.get('search', '').strip()
     if search:
         posts_query = posts_query.filter(Post.title.contains(search))
-    
-    # Pagination
-    page = request.args.get('page', 1, type=int)
+
+    # Eager-load relationships the listing template walks: joinedload for
+    # many-to-one (one row per post), selectinload for collections (one
+    # IN-batch, no row multiplication)
+    posts_query = posts_query.options(
+        joinedload(Post.author),
+        joinedload(Post.category),
+        selectinload(Post.tags),
+    )
+    if current_app.config.get('STRICT_LOADING'):
+        # Any relationship the template walks that isn't listed above
+        # raises instead of silently issuing an N+1 query
+        posts_query = posts_query.options(raiseload('*'))
+
+    # Pagination (keyset: constant cost at any depth, no COUNT(*))
     posts_per_page = current_app.config.get('ADMIN_POSTS_PER_PAGE', 20)
+
+    posts = keyset_paginate(posts_query, (Post.created_at, Post.id),
+                            posts_per_page, cursor=request.args.get('after'))
     
-    posts = posts_query.order_by(Post.created_at.desc())\
-                      .paginate(page=page, per_page=posts_per_page, error_out=False)
-    
-    # Get categories for filter
-    categories = Category.for_tenant().filter_by(is_active=True).all()
+    # Get categories for filter (cached per tenant)
+    categories = active_categories(tenant.id)
     
     return render_template('dashboard/posts.html',
                          tenant=tenant,
@@ -142,26 +169,17 @@ def new_post():
         db.session.add(post)
         db.session.flush()  # Get the post ID
         
-        # Handle tags
-        if tags_input:
-            tag_names = [name.strip() for name in tags_input.split(',') if name.strip()]
-            for tag_name in tag_names:
-                # Find or create tag
-                tag = Tag.for_tenant().filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(tenant_id=tenant.id, name=tag_name)
-                    db.session.add(tag)
-                post.tags.append(tag)
-        
+        # Handle tags (batched find-or-create)
+        sync_post_tags(post, tenant.id, tags_input)
+
         db.session.commit()
-        
+
         flash('Post created successfully!', 'success')
         return redirect(url_for('dashboard.edit_post', id=post.id))
     
-    # GET request - show form
-    categories = Category.for_tenant().filter_by(is_active=True)\
-                       .order_by(Category.sort_order, Category.name).all()
-    
+    # GET request - show form (cached category list)
+    categories = active_categories(tenant.id)
+
     return render_template('dashboard/edit_post.html',
                          tenant=tenant,
                          post=None,
@@ -173,8 +191,14 @@ def edit_post(id):
     """Edit existing post"""
     tenant = get_current_tenant()
     
-    # Get post and check permissions
-    post = Post.for_tenant().filter_by(id=id).first_or_404()
+    # Get post and check permissions (tags are rendered in the form).
+    # On POST the row is locked so two concurrent edits serialize
+    # instead of interleaving their tag rewrites (no-op on SQLite).
+    post_query = Post.for_tenant().options(selectinload(Post.tags))\
+                     .filter_by(id=id)
+    if request.method == 'POST':
+        post_query = post_query.with_for_update()
+    post = post_query.first_or_404()
     
     if not current_user.can_edit_post(post):
         flash('You do not have permission to edit this post.', 'error')
@@ -210,36 +234,33 @@ def edit_post(id):
             post.published_at = datetime.utcnow()
         post.status = status
         
-        # Handle tags
-        post.tags.clear()  # Remove existing tags
-        if tags_input:
-            tag_names = [name.strip() for name in tags_input.split(',') if name.strip()]
-            for tag_name in tag_names:
-                # Find or create tag
-                tag = Tag.for_tenant().filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(tenant_id=tenant.id, name=tag_name)
-                    db.session.add(tag)
-                post.tags.append(tag)
-        
+        # Handle tags (batched find-or-create, replaces the old set)
+        sync_post_tags(post, tenant.id, tags_input)
+
         db.session.commit()
         
         flash('Post updated successfully!', 'success')
         return redirect(url_for('dashboard.edit_post', id=id))
     
-    # GET request - show form
-    categories = Category.for_tenant().filter_by(is_active=True)\
-                       .order_by(Category.sort_order, Category.name).all()
-    
+    # GET request - show form (cached category list)
+    categories = active_categories(tenant.id)
+
     # Get current tags as comma-separated string
     current_tags = ', '.join([tag.name for tag in post.tags])
-    
-    return render_template('dashboard/edit_post.html',
+
+    # Conditional response: a revisit (e.g. the redirect after save, or
+    # back/forward) of an unchanged post answers 304 from the validator
+    # instead of re-rendering the form
+    response = make_response(render_template('dashboard/edit_post.html',
                          tenant=tenant,
                          post=post,
                          categories=categories,
                          current_tags=current_tags,
-                         is_new=False)
+                         is_new=False))
+    updated = post.updated_at.timestamp() if post.updated_at else 0
+    response.set_etag(f'{post.id}-{updated}-{len(post.tags)}', weak=True)
+    response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response.make_conditional(request)
 
 @bp.route('/posts/<int:id>/delete', methods=['POST'])
 def delete_post(id):
@@ -265,16 +286,15 @@ def media():
     tenant = get_current_tenant()
     
     # Get media files for this tenant
-    page = request.args.get('page', 1, type=int)
     file_type = request.args.get('type', '')
-    
+
     media_query = MediaFile.for_tenant()
-    
+
     if file_type:
         media_query = media_query.filter_by(file_type=file_type)
-    
-    media_files = media_query.order_by(MediaFile.created_at.desc())\
-                            .paginate(page=page, per_page=20, error_out=False)
+
+    media_files = keyset_paginate(media_query, (MediaFile.created_at, MediaFile.id),
+                                  20, cursor=request.args.get('after'))
     
     return render_template('dashboard/media.html',
                          tenant=tenant,
@@ -293,10 +313,10 @@ def upload_media():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    # Check file extension
-    allowed_extensions = current_app.config['ALLOWED_EXTENSIONS']
-    if not ('.' in file.filename and 
-            file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+    # Check file extension (splitext is C-level; the config set is a
+    # frozenset so membership is O(1))
+    ext = os.path.splitext(file.filename)[1][1:].lower()
+    if not ext or ext not in current_app.config['ALLOWED_EXTENSIONS']:
         return jsonify({'error': 'File type not allowed'}), 400
     
     try:
@@ -311,18 +331,23 @@ def upload_media():
         os.makedirs(upload_dir, exist_ok=True)
         
         file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
-        
-        # Get file info
-        file_size = os.path.getsize(file_path)
-        mime_type = file.content_type or 'application/octet-stream'
+        file_size = save_upload(file, file_path)
+
+        # Get file info; sniff the real MIME type when libmagic is
+        # available instead of trusting the client-supplied one
+        if magic is not None:
+            mime_type = magic.from_file(file_path, mime=True)
+        else:
+            mime_type = file.content_type or 'application/octet-stream'
         file_type = MediaFile.get_file_type(mime_type)
         
-        # Get image dimensions if it's an image
+        # Get image dimensions if it's an image; draft() keeps JPEG
+        # reads header-only so the request thread never decodes pixels
         width = height = None
         if file_type == 'image':
             try:
                 with Image.open(file_path) as img:
+                    img.draft('RGB', (1, 1))
                     width, height = img.size
             except Exception:
                 pass
@@ -1,21 +1,38 @@
-from flask import Blueprint, render_template, request, jsonify, current_app, url_for
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+from flask import Blueprint, render_template, request, jsonify, current_app, url_for, abort, Response
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from flask_login import current_user
 from app.utils.tenant import get_current_tenant, tenant_required
+from app.utils.helpers import active_categories
+from app.utils.pagination import keyset_paginate, paginate_fast
 from app.models import Post, Category, Tag
-from app import db, cache
+from app import db, cache, limiter, posts_cache_version
 from datetime import datetime
 
 bp = Blueprint('main', __name__)
 
+def _page_cache_key():
+    """Cache key for anonymous page caching: tenant + post-list version
+    + path + query string, so publishing a post (which bumps the
+    version) implicitly invalidates every cached page of the tenant.
+    The path (not just the endpoint) keeps parameterized routes like
+    /category/<slug> from colliding on one cached body."""
+    tenant = get_current_tenant()
+    tenant_id = tenant.id if tenant else 0
+    return (f'page:{tenant_id}:{posts_cache_version(tenant_id)}:'
+            f'{request.path}:{request.query_string.decode()}')
+
+def _skip_page_cache():
+    """Never serve logged-in visitors from the anonymous page cache"""
+    return current_user.is_authenticated
+
+# Prebuilt body for the health probe: platforms poll it every few
+# seconds, so skip per-request dict building and JSON serialization
+_HEALTH_BODY = '{"status": "healthy", "service": "multisutra-cms"}'
+
 @bp.route('/health')
 def health_check():
     """Health check endpoint for deployment platforms"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'service': 'multisutra-cms'
-    }), 200
+    return Response(_HEALTH_BODY, mimetype='application/json')
 
 @bp.route('/setup', methods=['GET', 'POST'])
 def quick_setup():
@@ -24,7 +41,9 @@ def quick_setup():
     from app.models.user import User
     
     if request.method == 'POST':
-        # Create default tenant if it doesn't exist
+        # Create default tenant if it doesn't exist. flush() assigns
+        # the id without ending the transaction, so tenant and admin
+        # user land in one commit (one fsync) instead of two
         tenant = Tenant.query.filter_by(subdomain='main').first()
         if not tenant:
             tenant = Tenant(
@@ -35,7 +54,7 @@ def quick_setup():
                 created_at=datetime.utcnow()
             )
             db.session.add(tenant)
-            db.session.commit()
+            db.session.flush()
         
         # Create admin user
         email = request.form.get('email', 'admin@example.com')
@@ -64,35 +83,17 @@ def quick_setup():
                 'email': email
             })
         else:
+            # Persist the tenant if this request created it
+            db.session.commit()
             return jsonify({'message': 'Setup already completed', 'login_url': url_for('auth.login')})
     
-    return '''
-    <html>
-    <head><title>MultiSutra CMS - Quick Setup</title></head>
-    <body style="font-family: Arial, sans-serif; max-width: 500px; margin: 50px auto; padding: 20px;">
-        <h1>🚀 MultiSutra CMS Setup</h1>
-        <p>Set up your blog and admin account:</p>
-        <form method="POST">
-            <div style="margin-bottom: 15px;">
-                <label>Admin Email:</label><br>
-                <input type="email" name="email" value="admin@example.com" required style="width: 100%; padding: 8px; margin-top: 5px;">
-            </div>
-            <div style="margin-bottom: 15px;">
-                <label>Admin Password:</label><br>
-                <input type="password" name="password" value="admin123" required style="width: 100%; padding: 8px; margin-top: 5px;">
-            </div>
-            <button type="submit" style="background: #007cba; color: white; padding: 10px 20px; border: none; cursor: pointer;">
-                Create Blog & Admin Account
-            </button>
-        </form>
-        <p style="margin-top: 30px; color: #666; font-size: 14px;">
-            After setup, you can access:<br>
-            • <a href="/auth/login">Login Page</a><br>
-            • <a href="/dashboard/">Dashboard</a>
-        </p>
-    </body>
-    </html>
-    '''
+    # The form is static; cache the rendered bytes rather than
+    # re-rendering for every GET
+    html = cache.get('setup:html')
+    if html is None:
+        html = render_template('main/setup.html')
+        cache.set('setup:html', html, timeout=3600)
+    return html
 
 @bp.before_app_request
 def before_request():
@@ -101,6 +102,7 @@ def before_request():
     get_current_tenant()
 
 @bp.route('/')
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def index():
     """Homepage - shows recent posts for the tenant"""
     tenant = get_current_tenant()
@@ -109,22 +111,32 @@ def index():
         # Main domain - show tenant selection or landing page
         return render_template('main/landing.html')
     
-    # Get published posts for this tenant
-    page = request.args.get('page', 1, type=int)
+    # Get published posts for this tenant (keyset pagination: no OFFSET
+    # scan and no COUNT(*), stays O(page size) at any depth)
     posts_per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-    
-    posts = Post.for_tenant(tenant.id).filter_by(status='published')\
-                .order_by(Post.published_at.desc())\
-                .paginate(page=page, per_page=posts_per_page, error_out=False)
-    
+
+    posts_query = Post.for_tenant(tenant.id).filter_by(status='published')\
+        .options(joinedload(Post.author), joinedload(Post.category),
+                 selectinload(Post.tags))
+    if current_app.config.get('STRICT_LOADING'):
+        # Fail fast on relationships the template walks but we forgot
+        # to eager-load
+        posts_query = posts_query.options(raiseload('*'))
+
+    posts = keyset_paginate(
+        posts_query,
+        (Post.published_at, Post.id),
+        posts_per_page,
+        cursor=request.args.get('after'))
+
     # Get featured posts
     featured_posts = Post.for_tenant(tenant.id)\
                         .filter_by(status='published', is_featured=True)\
+                        .options(joinedload(Post.author), joinedload(Post.category))\
                         .order_by(Post.published_at.desc()).limit(3).all()
     
-    # Get recent categories with post counts
-    categories = Category.for_tenant(tenant.id).filter_by(is_active=True)\
-                        .order_by(Category.sort_order, Category.name).all()
+    # Get recent categories with post counts (cached per tenant)
+    categories = active_categories(tenant.id)
     
     return render_template('main/index.html',
                          tenant=tenant,
@@ -138,20 +150,29 @@ def post_detail(slug):
     """Post detail page"""
     tenant = get_current_tenant()
     
-    post = Post.for_tenant(tenant.id).filter_by(slug=slug, status='published').first_or_404()
-    
+    # One round-trip fetches the post and its related posts together:
+    # rows matching the slug sort first, then up to three published
+    # posts sharing its category (resolved by a scalar subquery) in
+    # recency order. Eager-loading keeps the template off lazy loads.
+    ranked = db.case((Post.slug == slug, 0), else_=1)
+    category_subq = db.select(Post.category_id)\
+        .where(Post.tenant_id == tenant.id, Post.slug == slug)\
+        .scalar_subquery()
+    rows = Post.for_tenant(tenant.id)\
+               .options(joinedload(Post.author), joinedload(Post.category),
+                        selectinload(Post.tags))\
+               .filter(Post.status == 'published',
+                       db.or_(Post.slug == slug,
+                              Post.category_id == category_subq))\
+               .order_by(ranked, Post.published_at.desc()).limit(4).all()
+    if not rows or rows[0].slug != slug:
+        abort(404)
+    post = rows[0]
+    related_posts = rows[1:]
+
     # Increment view count
     post.increment_view_count()
     
-    # Get related posts (same category, excluding current post)
-    related_posts = []
-    if post.category:
-        related_posts = Post.for_tenant(tenant.id)\
-                           .filter(Post.category_id == post.category.id,
-                                 Post.id != post.id,
-                                 Post.status == 'published')\
-                           .order_by(Post.published_at.desc()).limit(3).all()
-    
     return render_template('main/post_detail.html',
                          tenant=tenant,
                          post=post,
@@ -159,18 +180,20 @@ def post_detail(slug):
 
 @bp.route('/category/<slug>')
 @tenant_required
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def category_posts(slug):
     """Posts in a specific category"""
     tenant = get_current_tenant()
     
     category = Category.for_tenant(tenant.id).filter_by(slug=slug, is_active=True).first_or_404()
     
-    page = request.args.get('page', 1, type=int)
     posts_per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-    
-    posts = Post.for_tenant(tenant.id).filter_by(category=category, status='published')\
-                .order_by(Post.published_at.desc())\
-                .paginate(page=page, per_page=posts_per_page, error_out=False)
+
+    posts = keyset_paginate(
+        Post.for_tenant(tenant.id).filter_by(category=category, status='published'),
+        (Post.published_at, Post.id),
+        posts_per_page,
+        cursor=request.args.get('after'))
     
     return render_template('main/category_posts.html',
                          tenant=tenant,
@@ -179,18 +202,27 @@ def category_posts(slug):
 
 @bp.route('/tag/<slug>')
 @tenant_required
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def tag_posts(slug):
     """Posts with a specific tag"""
     tenant = get_current_tenant()
     
     tag = Tag.for_tenant(tenant.id).filter_by(slug=slug).first_or_404()
     
-    page = request.args.get('page', 1, type=int)
     posts_per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-    
-    posts = Post.for_tenant(tenant.id).filter(Post.tags.contains(tag), Post.status == 'published')\
-                .order_by(Post.published_at.desc())\
-                .paginate(page=page, per_page=posts_per_page, error_out=False)
+
+    # Explicit join against the association table (instead of the EXISTS
+    # that .contains() compiles to) so the planner walks the
+    # (tag_id, post_id) index directly
+    from app.models.post import post_tags
+    posts = keyset_paginate(
+        Post.for_tenant(tenant.id)
+            .join(post_tags, db.and_(post_tags.c.post_id == Post.id,
+                                     post_tags.c.tag_id == tag.id))
+            .filter(Post.status == 'published'),
+        (Post.published_at, Post.id),
+        posts_per_page,
+        cursor=request.args.get('after'))
     
     return render_template('main/tag_posts.html',
                          tenant=tenant,
@@ -199,26 +231,44 @@ def tag_posts(slug):
 
 @bp.route('/search')
 @tenant_required
+@limiter.limit('30 per minute')
+@cache.cached(timeout=120, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def search():
     """Search posts"""
     tenant = get_current_tenant()
     query = request.args.get('q', '').strip()
-    
+
     if not query:
         return render_template('main/search.html', tenant=tenant, query=query, posts=None)
-    
+
     page = request.args.get('page', 1, type=int)
     posts_per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-    
-    # Simple search in title and content
-    posts = Post.for_tenant(tenant.id)\
-                .filter(db.or_(
-                    Post.title.contains(query),
-                    Post.content.contains(query),
-                    Post.excerpt.contains(query)
-                ), Post.status == 'published')\
-                .order_by(Post.published_at.desc())\
-                .paginate(page=page, per_page=posts_per_page, error_out=False)
+
+    posts_query = Post.for_tenant(tenant.id).filter(Post.status == 'published')
+
+    if db.engine.dialect.name == 'postgresql':
+        # Full-text search; the expression must match the posts_search_tsv
+        # GIN index so the OR'd LIKE scans become an index lookup
+        tsquery = db.func.plainto_tsquery('english', query)
+        document = db.func.to_tsvector('english', Post.title + ' ' + Post.content)
+        posts_query = posts_query.filter(document.op('@@')(tsquery))\
+                                 .order_by(db.func.ts_rank(document, tsquery).desc())
+    else:
+        # Substring fallback for SQLite dev databases. A one- or
+        # two-character needle matches most rows, so LIKE-scanning for
+        # it is a cheap way to pin the DB; FTS above handles short
+        # tokens fine via the GIN index
+        if len(query) < 3:
+            return render_template('main/search.html', tenant=tenant, query=query,
+                                   posts=None,
+                                   error='Search term must be at least 3 characters')
+        posts_query = posts_query.filter(db.or_(
+            Post.title.contains(query),
+            Post.content.contains(query),
+            Post.excerpt.contains(query)
+        )).order_by(Post.published_at.desc())
+
+    posts = paginate_fast(posts_query, Post.id, page, posts_per_page)
     
     return render_template('main/search.html',
                          tenant=tenant,
@@ -227,39 +277,58 @@ def search():
 
 @bp.route('/archive')
 @tenant_required
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def archive():
     """Post archive by date"""
     tenant = get_current_tenant()
-    
-    # Get posts grouped by year and month
-    posts_by_date = db.session.query(
-        db.extract('year', Post.published_at).label('year'),
-        db.extract('month', Post.published_at).label('month'),
-        db.func.count(Post.id).label('count')
-    ).filter(
-        Post.tenant_id == tenant.id,
-        Post.status == 'published'
-    ).group_by('year', 'month').order_by('year desc', 'month desc').all()
-    
+
+    # Get posts grouped by year and month; the group-by scans every
+    # published row, so cache the aggregate per tenant (Post events
+    # invalidate)
+    posts_by_date = cache.get(f'archive:{tenant.id}')
+    if posts_by_date is None:
+        posts_by_date = [row._asdict() for row in db.session.query(
+            db.extract('year', Post.published_at).label('year'),
+            db.extract('month', Post.published_at).label('month'),
+            db.func.count(Post.id).label('count')
+        ).filter(
+            Post.tenant_id == tenant.id,
+            Post.status == 'published'
+        ).group_by('year', 'month').order_by('year desc', 'month desc').all()]
+        cache.set(f'archive:{tenant.id}', posts_by_date, timeout=3600)
+
     return render_template('main/archive.html',
                          tenant=tenant,
                          posts_by_date=posts_by_date)
 
 @bp.route('/archive/<int:year>/<int:month>')
 @tenant_required
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def archive_posts(year, month):
     """Posts for a specific month"""
     tenant = get_current_tenant()
     
-    page = request.args.get('page', 1, type=int)
     posts_per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-    
-    posts = Post.for_tenant(tenant.id)\
-                .filter(db.extract('year', Post.published_at) == year,
-                       db.extract('month', Post.published_at) == month,
-                       Post.status == 'published')\
-                .order_by(Post.published_at.desc())\
-                .paginate(page=page, per_page=posts_per_page, error_out=False)
+
+    # <int:year> accepts any non-negative int; keep it inside what
+    # datetime can represent (9998 so year + 1 below stays valid)
+    if not 1 <= month <= 12 or not 1 <= year <= 9998:
+        abort(404)
+
+    # Filter on a half-open published_at range instead of EXTRACT so the
+    # (tenant_id, status, published_at, id) index serves the scan
+    month_start = datetime(year, month, 1)
+    month_end = datetime(year + 1, 1, 1) if month == 12 \
+        else datetime(year, month + 1, 1)
+
+    posts = keyset_paginate(
+        Post.for_tenant(tenant.id)
+            .filter(Post.published_at >= month_start,
+                    Post.published_at < month_end,
+                    Post.status == 'published'),
+        (Post.published_at, Post.id),
+        posts_per_page,
+        cursor=request.args.get('after'))
     
     return render_template('main/archive_posts.html',
                          tenant=tenant,
@@ -273,25 +342,51 @@ def sitemap():
     """Generate XML sitemap for the tenant"""
     tenant = get_current_tenant()
     
-    # Get all published posts
-    posts = Post.for_tenant(tenant.id).filter_by(status='published')\
-                .order_by(Post.published_at.desc()).all()
-    
-    # Get all active categories
-    categories = Category.for_tenant(tenant.id).filter_by(is_active=True).all()
-    
-    # Get all tags with posts
-    tags = Tag.for_tenant(tenant.id).join(Post.tags)\
-              .filter(Post.status == 'published').distinct().all()
-    
-    return render_template('main/sitemap.xml',
-                         tenant=tenant,
-                         posts=posts,
-                         categories=categories,
-                         tags=tags), 200, {'Content-Type': 'application/xml'}
+    # Crawlers refetch the sitemap constantly; serve the rendered XML
+    # from cache and only regenerate after a post changes
+    xml = cache.get(f'sitemap:{tenant.id}')
+    if xml is None:
+        # Get all published posts. load_only skips hydrating content
+        # (the sitemap only needs slug + updated_at) and yield_per
+        # fetches in batches so a 100k-post tenant doesn't pull every
+        # row into memory at once; category/tags are walked per URL
+        # entry so they stay eager-loaded
+        posts_query = Post.for_tenant(tenant.id).filter_by(status='published')\
+                          .options(load_only(Post.slug, Post.updated_at,
+                                             Post.published_at),
+                                   selectinload(Post.category), selectinload(Post.tags))
+        if current_app.config.get('STRICT_LOADING'):
+            posts_query = posts_query.options(raiseload('*'))
+        posts = posts_query.order_by(Post.published_at.desc()).yield_per(500)
+
+        # Get all active categories
+        categories = Category.for_tenant(tenant.id).filter_by(is_active=True).all()
+
+        # Get all tags with posts. Two narrow queries instead of
+        # join-then-DISTINCT over whole Tag rows: the DISTINCT runs on
+        # bare tag_ids from the association table, then the handful of
+        # matching tags are fetched by primary key
+        from app.models.post import post_tags
+        tag_ids = db.session.execute(
+            db.select(post_tags.c.tag_id).distinct()
+            .where(post_tags.c.post_id.in_(
+                db.select(Post.id).where(Post.tenant_id == tenant.id,
+                                         Post.status == 'published')))
+        ).scalars().all()
+        tags = Tag.query.filter(Tag.id.in_(tag_ids)).all() if tag_ids else []
+
+        xml = render_template('main/sitemap.xml',
+                              tenant=tenant,
+                              posts=posts,
+                              categories=categories,
+                              tags=tags)
+        cache.set(f'sitemap:{tenant.id}', xml, timeout=3600)
+
+    return xml, 200, {'Content-Type': 'application/xml'}
 
 @bp.route('/robots.txt')
 @tenant_required
+@cache.cached(timeout=300, make_cache_key=_page_cache_key, unless=_skip_page_cache)
 def robots():
     """Generate robots.txt for the tenant"""
     tenant = get_current_tenant()
@@ -304,10 +399,17 @@ def rss_feed():
     """Generate RSS feed for the tenant"""
     tenant = get_current_tenant()
     
-    # Get recent published posts
-    posts = Post.for_tenant(tenant.id).filter_by(status='published')\
-                .order_by(Post.published_at.desc()).limit(20).all()
-    
-    return render_template('main/feed.xml',
-                         tenant=tenant,
-                         posts=posts), 200, {'Content-Type': 'application/rss+xml'}
\ No newline at end of file
+    # Feed readers poll aggressively; serve the rendered XML from cache
+    xml = cache.get(f'feed:{tenant.id}')
+    if xml is None:
+        # Get recent published posts (author is rendered per entry)
+        posts = Post.for_tenant(tenant.id).filter_by(status='published')\
+                    .options(joinedload(Post.author))\
+                    .order_by(Post.published_at.desc()).limit(20).all()
+
+        xml = render_template('main/feed.xml',
+                              tenant=tenant,
+                              posts=posts)
+        cache.set(f'feed:{tenant.id}', xml, timeout=3600)
+
+    return xml, 200, {'Content-Type': 'application/rss+xml'}
\ No newline at end of file
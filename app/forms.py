@@ -23,21 +23,38 @@ class RegisterForm(FlaskForm):
     password = PasswordField('Password', validators=[DataRequired(), Length(min=8)], render_kw={'placeholder': 'Password'})
     confirm_password = PasswordField('Confirm Password', validators=[DataRequired(), EqualTo('password', message='Passwords must match')], render_kw={'placeholder': 'Confirm Password'})
 
-    def validate_username(self, username):
-        """Check if username already exists in current tenant"""
-        tenant = get_current_tenant()
-        if tenant:
-            user = User.for_tenant(tenant.id).filter_by(username=username.data).first()
-            if user:
-                raise ValidationError('Username already exists. Please choose a different one.')
+    def validate(self, extra_validators=None):
+        """Run field validators, then one combined uniqueness check
+
+        Both EXISTS probes ride in a single SELECT instead of one query
+        per field; the per-tenant unique constraints still back this up
+        under concurrent registration.
+        """
+        if not super().validate(extra_validators):
+            return False
 
-    def validate_email(self, email):
-        """Check if email already exists in current tenant"""
         tenant = get_current_tenant()
-        if tenant:
-            user = User.for_tenant(tenant.id).filter_by(email=email.data.lower()).first()
-            if user:
-                raise ValidationError('Email already registered. Please use a different email or login.')
+        if not tenant:
+            return True
+
+        from app import db
+        from sqlalchemy import select, exists
+
+        row = db.session.execute(select(
+            exists().where(User.tenant_id == tenant.id,
+                           User.email == self.email.data.lower()).label('email_taken'),
+            exists().where(User.tenant_id == tenant.id,
+                           User.username == self.username.data.strip()).label('username_taken'),
+        )).one()
+
+        ok = True
+        if row.email_taken:
+            self.email.errors.append('Email already registered. Please use a different email or login.')
+            ok = False
+        if row.username_taken:
+            self.username.errors.append('Username already exists. Please choose a different one.')
+            ok = False
+        return ok
 
 class ProfileForm(FlaskForm):
     """User profile update form"""
@@ -1,238 +0,0 @@
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
-import secrets
-from app import db
-
-# Association table for many-to-many relationship between posts and tags
-post_tags = db.Table('post_tags',
-    db.Column('post_id', db.Integer, db.ForeignKey('posts.id'), primary_key=True),
-    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True)
-)
-
-class User(UserMixin, db.Model):
-    """User model for the blog"""
-    __tablename__ = 'users'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False, index=True)
-    email = db.Column(db.String(255), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(255), nullable=False)
-    first_name = db.Column(db.String(100))
-    last_name = db.Column(db.String(100))
-    bio = db.Column(db.Text)
-    avatar_url = db.Column(db.String(500))
-    website_url = db.Column(db.String(500))
-    role = db.Column(db.String(20), default='editor', nullable=False)  # admin, editor, author
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_login = db.Column(db.DateTime)
-    
-    # Relationships
-    posts = db.relationship('Post', back_populates='author', lazy='dynamic')
-    
-    def set_password(self, password):
-        """Set password hash"""
-        self.password_hash = generate_password_hash(password)
-    
-    def check_password(self, password):
-        """Check if password is correct"""
-        return check_password_hash(self.password_hash, password)
-    
-    @property
-    def full_name(self):
-        """Get full name"""
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        return self.username
-    
-    def __repr__(self):
-        return f'<User {self.username}>'
-
-class Category(db.Model):
-    """Category model for organizing posts"""
-    __tablename__ = 'categories'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
-    slug = db.Column(db.String(100), unique=True, nullable=False, index=True)
-    description = db.Column(db.Text)
-    color = db.Column(db.String(7), default='#007bff')  # Hex color code
-    sort_order = db.Column(db.Integer, default=0, nullable=False)
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Relationships
-    posts = db.relationship('Post', back_populates='category', lazy='dynamic')
-    
-    def __repr__(self):
-        return f'<Category {self.name}>'
-
-class Tag(db.Model):
-    """Tag model for labeling posts"""
-    __tablename__ = 'tags'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(50), unique=True, nullable=False, index=True)
-    slug = db.Column(db.String(50), unique=True, nullable=False, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    
-    # Relationships
-    posts = db.relationship('Post', secondary=post_tags, back_populates='tags')
-    
-    def __repr__(self):
-        return f'<Tag {self.name}>'
-
-class Post(db.Model):
-    """Post model for blog posts"""
-    __tablename__ = 'posts'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(255), nullable=False)
-    slug = db.Column(db.String(255), unique=True, nullable=False, index=True)
-    content = db.Column(db.Text)
-    excerpt = db.Column(db.Text)
-    featured_image_url = db.Column(db.String(500))
-    status = db.Column(db.String(20), default='draft', nullable=False)  # draft, published, archived
-    is_featured = db.Column(db.Boolean, default=False, nullable=False)
-    view_count = db.Column(db.Integer, default=0, nullable=False)
-    like_count = db.Column(db.Integer, default=0, nullable=False)
-    
-    # SEO fields
-    meta_title = db.Column(db.String(255))
-    meta_description = db.Column(db.String(500))
-    meta_keywords = db.Column(db.String(500))
-    
-    # Foreign keys
-    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
-    
-    # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    published_at = db.Column(db.DateTime)
-    
-    # Relationships
-    author = db.relationship('User', back_populates='posts')
-    category = db.relationship('Category', back_populates='posts')
-    tags = db.relationship('Tag', secondary=post_tags, back_populates='posts')
-    comments = db.relationship('Comment', back_populates='post', cascade='all, delete-orphan')
-    
-    @property
-    def is_published(self):
-        """Check if post is published"""
-        return self.status == 'published'
-    
-    def increment_view_count(self):
-        """Increment view count"""
-        self.view_count += 1
-        db.session.commit()
-    
-    def __repr__(self):
-        return f'<Post {self.title}>'
-
-class Comment(db.Model):
-    """Comment model for post comments"""
-    __tablename__ = 'comments'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(255), nullable=False)
-    website = db.Column(db.String(500))
-    content = db.Column(db.Text, nullable=False)
-    is_approved = db.Column(db.Boolean, default=False, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    
-    # Foreign key
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.id'), nullable=False)
-    
-    # Relationships
-    post = db.relationship('Post', back_populates='comments')
-    
-    def __repr__(self):
-        return f'<Comment by {self.name} on {self.post.title}>'
-
-class MediaFile(db.Model):
-    """Media file model for uploads"""
-    __tablename__ = 'media_files'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    filename = db.Column(db.String(255), nullable=False)
-    original_filename = db.Column(db.String(255), nullable=False)
-    file_path = db.Column(db.String(500), nullable=False)
-    file_size = db.Column(db.Integer)
-    mime_type = db.Column(db.String(100))
-    width = db.Column(db.Integer)  # For images
-    height = db.Column(db.Integer)  # For images
-    alt_text = db.Column(db.String(255))
-    description = db.Column(db.Text)
-    uploaded_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    
-    # Relationships
-    uploaded_by = db.relationship('User')
-    
-    @property
-    def is_image(self):
-        """Check if file is an image"""
-        return self.mime_type and self.mime_type.startswith('image/')
-    
-    def __repr__(self):
-        return f'<MediaFile {self.filename}>'
-
-class Setting(db.Model):
-    """Settings model for blog configuration"""
-    __tablename__ = 'settings'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    key = db.Column(db.String(100), unique=True, nullable=False, index=True)
-    value = db.Column(db.Text)
-    description = db.Column(db.String(255))
-    setting_type = db.Column(db.String(20), default='text')  # text, number, boolean, json
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    @classmethod
-    def get_value(cls, key, default=None):
-        """Get setting value by key"""
-        setting = cls.query.filter_by(key=key).first()
-        if setting:
-            if setting.setting_type == 'boolean':
-                return setting.value.lower() in ('true', '1', 'yes', 'on')
-            elif setting.setting_type == 'number':
-                try:
-                    return int(setting.value)
-                except (ValueError, TypeError):
-                    return default
-            elif setting.setting_type == 'json':
-                try:
-                    import json
-                    return json.loads(setting.value)
-                except (ValueError, TypeError):
-                    return default
-            return setting.value
-        return default
-    
-    @classmethod
-    def set_value(cls, key, value, description=None, setting_type='text'):
-        """Set setting value"""
-        setting = cls.query.filter_by(key=key).first()
-        if setting:
-            setting.value = str(value)
-            setting.updated_at = datetime.utcnow()
-        else:
-            setting = cls(
-                key=key, 
-                value=str(value), 
-                description=description, 
-                setting_type=setting_type
-            )
-            db.session.add(setting)
-        db.session.commit()
-        return setting
-    
-    def __repr__(self):
-        return f'<Setting {self.key}>'
\ No newline at end of file
@@ -8,11 +8,38 @@ from app.models.setting import Setting, Comment
 
 __all__ = [
     'Tenant',
-    'User', 
+    'User',
     'Post',
     'Category',
     'Tag',
     'MediaFile',
     'Setting',
     'Comment'
-]
\ No newline at end of file
+]
+
+from sqlalchemy import event, text
+
+def _create_updated_at_trigger(target, connection, **kw):
+    """Maintain updated_at in the database (Postgres only)
+
+    The Python onupdate default only fires on ORM flushes, so core
+    UPDATE statements (batched view counts, bulk publishes) would skip
+    the timestamp. A BEFORE UPDATE trigger keeps it correct for every
+    write path; the onupdate stays on the columns for SQLite dev
+    databases, where the trigger doesn't exist.
+    """
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text(
+            "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ "
+            "BEGIN NEW.updated_at = now(); RETURN NEW; END; $$ LANGUAGE plpgsql"
+        ))
+        connection.execute(text(
+            f"DROP TRIGGER IF EXISTS trg_{target.name}_updated ON {target.name}"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER trg_{target.name}_updated BEFORE UPDATE "
+            f"ON {target.name} FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        ))
+
+for _model in (Tenant, User, Post, Category, Tag, MediaFile, Setting, Comment):
+    event.listen(_model.__table__, 'after_create', _create_updated_at_trigger)
\ No newline at end of file
@@ -27,14 +27,20 @@ class Category(TenantMixin, db.Model):
     
     # Status
     is_active = db.Column(db.Boolean, default=True, index=True)
-    
+
+    # Stats: denormalized published-post count, maintained by the Post
+    # listeners in models/post.py so reads never aggregate
+    post_count = db.Column(db.Integer, default=0, index=True)
+
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
     # Relationships
-    posts = db.relationship('Post', backref='category', lazy='dynamic')
-    children = db.relationship('Category', backref=db.backref('parent', remote_side=[id]), lazy='dynamic')
+    tenant = db.relationship('Tenant', back_populates='categories')
+    posts = db.relationship('Post', back_populates='category')
+    children = db.relationship('Category', back_populates='parent')
+    parent = db.relationship('Category', back_populates='children', remote_side=[id])
     
     # Unique constraint for slug per tenant
     __table_args__ = (
@@ -44,11 +50,6 @@ class Category(TenantMixin, db.Model):
     def __repr__(self):
         return f'<Category {self.name}>'
     
-    @property
-    def post_count(self):
-        """Get number of published posts in this category"""
-        return self.posts.filter_by(status='published').count()
-    
     @property
     def url(self):
         """Get category URL"""
@@ -60,21 +61,43 @@ class Category(TenantMixin, db.Model):
     
     @property
     def breadcrumb(self):
-        """Get breadcrumb trail"""
-        trail = []
-        current = self
-        while current:
-            trail.append(current)
-            current = current.parent
-        return list(reversed(trail))
+        """Get breadcrumb trail (root first)
+
+        Walking .parent upward lazy-loads one row per level; the
+        recursive CTE climbs the chain in a single query with a depth
+        column to restore root-first order.
+        """
+        path = db.select(Category.id, Category.parent_id,
+                         db.literal(0).label('depth'))\
+            .where(Category.id == self.id)\
+            .cte('category_path', recursive=True)
+        path = path.union_all(
+            db.select(Category.id, Category.parent_id, path.c.depth + 1)
+            .where(Category.id == path.c.parent_id))
+        return Category.query.join(path, Category.id == path.c.id)\
+                             .order_by(path.c.depth.desc()).all()
     
+    @classmethod
+    def descendants(cls, root_id, tenant_id):
+        """All descendants of a category in one recursive query
+
+        The old Python DFS issued one SELECT per node; the recursive
+        CTE walks the whole subtree in a single round trip (both
+        Postgres and SQLite support WITH RECURSIVE).
+        """
+        tree = db.select(cls.id)\
+            .where(cls.id == root_id, cls.tenant_id == tenant_id)\
+            .cte('category_tree', recursive=True)
+        tree = tree.union_all(
+            db.select(cls.id).where(cls.parent_id == tree.c.id,
+                                    cls.tenant_id == tenant_id))
+        return cls.query.filter(cls.id.in_(db.select(tree.c.id)),
+                                cls.id != root_id)\
+                        .order_by(cls.sort_order, cls.name).all()
+
     def get_all_children(self):
         """Get all descendant categories"""
-        children = []
-        for child in self.children:
-            children.append(child)
-            children.extend(child.get_all_children())
-        return children
+        return Category.descendants(self.id, self.tenant_id)
     
     def to_dict(self):
         """Convert category to dictionary"""
@@ -85,7 +108,7 @@ class Category(TenantMixin, db.Model):
             'description': self.description,
             'color': self.color,
             'icon': self.icon,
-            'post_count': self.post_count,
+            'post_count': self.post_count or 0,
             'is_active': self.is_active,
             'sort_order': self.sort_order,
             'url': self.url,
@@ -110,22 +133,67 @@ class Tag(TenantMixin, db.Model):
     
     # Stats
     use_count = db.Column(db.Integer, default=0, index=True)
-    
+
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Unique constraint for slug per tenant
+
+    # Relationships
+    tenant = db.relationship('Tenant', back_populates='tags')
+    posts = db.relationship('Post', secondary='post_tags', back_populates='tags')
+
+    # Unique constraint for slug per tenant; the name index backs the
+    # find-or-create lookup when saving post tags
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'slug', name='_tenant_tag_slug_uc'),
+        db.Index('ix_tags_tenant_name', 'tenant_id', 'name'),
     )
     
     def __repr__(self):
         return f'<Tag {self.name}>'
     
+    @classmethod
+    def counts_for_tenant(cls, tenant_id):
+        """Published post counts for every tag of a tenant
+
+        One grouped scan of the association table; feeds tag-cloud
+        style renders where all of a tenant's tags are shown at once.
+        Returns {tag_id: count} (tags with no published posts absent).
+        """
+        from app.models.post import Post, post_tags
+        return dict(db.session.execute(
+            db.select(post_tags.c.tag_id, db.func.count(post_tags.c.post_id))
+            .join(Post, Post.id == post_tags.c.post_id)
+            .where(Post.tenant_id == tenant_id, Post.status == 'published')
+            .group_by(post_tags.c.tag_id)).all())
+
+    @classmethod
+    def attach_post_counts(cls, tags):
+        """Bulk-load published post counts onto fetched tags
+
+        One grouped query over the association table fills _post_count
+        for the whole list, so serializing M tags costs 1 query
+        instead of M COUNTs.
+        """
+        from app.models.post import Post, post_tags
+        if not tags:
+            return tags
+        counts = dict(db.session.execute(
+            db.select(post_tags.c.tag_id, db.func.count(Post.id))
+            .join(Post, Post.id == post_tags.c.post_id)
+            .where(post_tags.c.tag_id.in_([t.id for t in tags]),
+                   Post.status == 'published')
+            .group_by(post_tags.c.tag_id)).all())
+        for tag in tags:
+            tag._post_count = counts.get(tag.id, 0)
+        return tags
+
     @property
     def post_count(self):
         """Get number of published posts with this tag"""
+        preloaded = getattr(self, '_post_count', None)
+        if preloaded is not None:
+            return preloaded
         from app.models.post import post_tags
         from app.models.post import Post
         return db.session.query(Post).join(post_tags).filter(
@@ -156,20 +224,44 @@ class Tag(TenantMixin, db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+@event.listens_for(Category.__table__, 'after_create')
+def create_category_name_index(target, connection, **kw):
+    """Create a prefix-search index on lower(name) (Postgres only)"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy import text
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS categories_name_prefix ON categories "
+            "(lower(name) varchar_pattern_ops)"
+        ))
+
+@event.listens_for(Tag.__table__, 'after_create')
+def create_tag_name_index(target, connection, **kw):
+    """Create a prefix-search index on lower(name) (Postgres only)"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy import text
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS tags_name_prefix ON tags "
+            "(lower(name) varchar_pattern_ops)"
+        ))
+
+@event.listens_for(Category, 'after_insert')
+@event.listens_for(Category, 'after_update')
+@event.listens_for(Category, 'after_delete')
+def invalidate_category_caches(mapper, connection, target):
+    """Drop the cached per-tenant category lists when categories change"""
+    from app import invalidate_tenant_globals
+    invalidate_tenant_globals(target.tenant_id)
+
 @event.listens_for(Category, 'before_insert')
 def generate_category_slug(mapper, connection, target):
     """Generate slug before insert if not provided"""
     if not target.slug and target.name:
-        import re
-        slug = re.sub(r'[^a-zA-Z0-9\-_\s]', '', target.name.lower())
-        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
-        target.slug = slug[:100]
+        from app.utils.helpers import slugify
+        target.slug = slugify(target.name, limit=100)
 
 @event.listens_for(Tag, 'before_insert')
 def generate_tag_slug(mapper, connection, target):
     """Generate slug before insert if not provided"""
     if not target.slug and target.name:
-        import re
-        slug = re.sub(r'[^a-zA-Z0-9\-_\s]', '', target.name.lower())
-        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
-        target.slug = slug[:50]
\ No newline at end of file
+        from app.utils.helpers import slugify
+        target.slug = slugify(target.name, limit=50)
\ No newline at end of file
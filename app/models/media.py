@@ -38,7 +38,18 @@ class MediaFile(TenantMixin, db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
+    # Relationships
+    tenant = db.relationship('Tenant', back_populates='media_files')
+    uploaded_by_user = db.relationship('User', back_populates='media_files',
+                                       foreign_keys=[uploaded_by])
+
+    # Library listing filters by type and orders by recency
+    __table_args__ = (
+        db.Index('ix_media_tenant_type_created',
+                 'tenant_id', 'file_type', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<MediaFile {self.filename}>'
     
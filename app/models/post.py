@@ -1,12 +1,19 @@
+import re
 from datetime import datetime
 from app import db
 from app.utils.tenant import TenantMixin
 from sqlalchemy import event
 
-# Association table for post-tag many-to-many relationship
+# Compiled once at import; these run on every excerpt/reading-time render
+_HTML_TAG = re.compile(r'<[^<]+?>')
+_WORD = re.compile(r'\w+')
+
+# Association table for post-tag many-to-many relationship; the extra
+# index leads with tag_id so tag-page lookups are an index range scan
 post_tags = db.Table('post_tags',
     db.Column('post_id', db.Integer, db.ForeignKey('posts.id'), primary_key=True),
-    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True),
+    db.Index('ix_post_tags_tag_post', 'tag_id', 'post_id'),
 )
 
 class Post(TenantMixin, db.Model):
@@ -50,18 +57,51 @@ class Post(TenantMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    tags = db.relationship('Tag', secondary=post_tags, backref=db.backref('posts', lazy='dynamic'))
-    comments = db.relationship('Comment', backref='post', lazy='dynamic', cascade='all, delete-orphan')
+    # Relationships (explicit back_populates so both sides declare their
+    # loader strategy); tags default to selectin since to_dict and the
+    # templates iterate them on nearly every load
+    tenant = db.relationship('Tenant', back_populates='posts')
+    author = db.relationship('User', back_populates='posts')
+    category = db.relationship('Category', back_populates='posts')
+    tags = db.relationship('Tag', secondary=post_tags, back_populates='posts',
+                           lazy='selectin')
+    comments = db.relationship('Comment', back_populates='post',
+                               cascade='all, delete-orphan')
     
-    # Unique constraint for slug per tenant
+    # Unique constraint for slug per tenant; the composite index backs
+    # the keyset-paginated published listings (seek on published_at, id)
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'slug', name='_tenant_slug_uc'),
+        db.Index('ix_posts_tenant_status_published_id',
+                 'tenant_id', 'status', 'published_at', 'id'),
+        # Category listings: range scan instead of filter-and-sort
+        db.Index('ix_posts_tenant_category_status_published',
+                 'tenant_id', 'category_id', 'status', 'published_at'),
+        # Non-admin dashboard listing (author's own posts by recency)
+        db.Index('ix_posts_tenant_author_created',
+                 'tenant_id', 'author_id', 'created_at'),
     )
     
     def __repr__(self):
         return f'<Post {self.title}>'
-    
+
+    @classmethod
+    def recent_published(cls, tenant_id=None, limit=5):
+        """Most recent published posts via a cached lambda statement
+
+        The same recency select backs sidebars, feeds and stats
+        helpers; lambda_stmt caches the constructed statement in the
+        lambda closure so repeated calls only swap bind values instead
+        of rebuilding and re-analyzing the select() each time.
+        """
+        from sqlalchemy import lambda_stmt, select
+        stmt = lambda_stmt(lambda: select(Post).where(Post.status == 'published')
+                           .order_by(Post.published_at.desc()))
+        if tenant_id is not None:
+            stmt += lambda s: s.where(Post.tenant_id == tenant_id)
+        stmt += lambda s: s.limit(limit)
+        return db.session.scalars(stmt).all()
+
     @property
     def is_published(self):
         """Check if post is published"""
@@ -95,10 +135,9 @@ class Post(TenantMixin, db.Model):
         """Estimate reading time in minutes"""
         if not self.content:
             return 0
-        
+
         # Average reading speed: 200-250 words per minute
-        import re
-        word_count = len(re.findall(r'\w+', self.content))
+        word_count = len(_WORD.findall(self.content))
         return max(1, round(word_count / 225))
     
     def publish(self):
@@ -116,10 +155,43 @@ class Post(TenantMixin, db.Model):
         self.status = 'scheduled'
         self.scheduled_at = scheduled_at
     
+    # Flush buffered view counts to the DB once this many accumulate
+    VIEW_FLUSH_EVERY = 10
+
     def increment_view_count(self):
-        """Increment view count"""
-        self.view_count += 1
-        db.session.commit()
+        """Buffer the view count in cache and flush it in batches
+
+        The old per-hit UPDATE+COMMIT put a write (and WAL traffic) on
+        every read of a hot post. Views now accumulate in a cache
+        counter and are folded into the row with a single UPDATE every
+        VIEW_FLUSH_EVERY hits, so the row sees 1/N of the writes.
+        """
+        from app import cache
+        key = f'pv:{self.id}'
+        if cache.get(key) is None:
+            cache.set(key, 1, timeout=0)
+            pending = 1
+        else:
+            pending = cache.cache.inc(key, 1)
+
+        if pending >= self.VIEW_FLUSH_EVERY:
+            cache.set(key, 0, timeout=0)
+            db.session.execute(
+                db.update(Post).where(Post.id == self.id)
+                .values(view_count=Post.view_count + pending))
+            db.session.commit()
+
+        # Keep the per-tenant running total in step so stats never have
+        # to re-sum every post row; only bump a counter that exists (a
+        # cold one is re-seeded from the DB sum when next read)
+        if cache.get(f'tenant_views:{self.tenant_id}') is not None:
+            cache.cache.inc(f'tenant_views:{self.tenant_id}', 1)
+
+    @property
+    def live_view_count(self):
+        """View count including buffered, not-yet-flushed views"""
+        from app import cache
+        return self.view_count + int(cache.get(f'pv:{self.id}') or 0)
     
     def get_excerpt(self, length=160):
         """Get excerpt with fallback to content"""
@@ -127,8 +199,7 @@ class Post(TenantMixin, db.Model):
             return self.excerpt[:length] + '...' if len(self.excerpt) > length else self.excerpt
         
         # Extract text from HTML content
-        import re
-        text = re.sub('<[^<]+?>', '', self.content)
+        text = _HTML_TAG.sub('', self.content)
         return text[:length] + '...' if len(text) > length else text
     
     def to_dict(self):
@@ -157,11 +228,107 @@ class Post(TenantMixin, db.Model):
             'tags': [tag.to_dict() for tag in self.tags]
         }
 
+@event.listens_for(Post.__table__, 'after_create')
+def create_post_search_index(target, connection, **kw):
+    """Create a full-text GIN index backing post search (Postgres only)"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy import text
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS posts_search_tsv ON posts "
+            "USING gin (to_tsvector('english', title || ' ' || content))"
+        ))
+        # Covering index so the dashboard stats aggregation (counts per
+        # status + SUM(view_count)) is an index-only scan
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS posts_tenant_status_views ON posts "
+            "(tenant_id, status) INCLUDE (view_count)"
+        ))
+        # Partial index for the featured strip on the homepage; only the
+        # handful of featured published rows are indexed
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS posts_tenant_featured ON posts "
+            "(tenant_id, published_at DESC) "
+            "WHERE is_featured AND status = 'published'"
+        ))
+
 @event.listens_for(Post, 'before_insert')
 def generate_slug(mapper, connection, target):
     """Generate slug before insert if not provided"""
     if not target.slug and target.title:
-        import re
-        slug = re.sub(r'[^a-zA-Z0-9\-_\s]', '', target.title.lower())
-        slug = re.sub(r'[\s_]+', '-', slug).strip('-')
-        target.slug = slug[:200]  # Limit slug length
\ No newline at end of file
+        from app.utils.helpers import slugify
+        target.slug = slugify(target.title, limit=200)
+
+def _shift_category_count(connection, category_id, delta):
+    """Adjust the denormalized Category.post_count by delta"""
+    from app.models.category import Category
+    connection.execute(
+        db.update(Category).where(Category.id == category_id)
+        .values(post_count=Category.post_count + delta))
+
+@event.listens_for(Post, 'after_insert')
+def bump_category_post_count(mapper, connection, target):
+    """Count a new published post against its category"""
+    if target.status == 'published' and target.category_id:
+        _shift_category_count(connection, target.category_id, 1)
+
+@event.listens_for(Post, 'after_delete')
+def drop_category_post_count(mapper, connection, target):
+    """Uncount a deleted published post from its category"""
+    if target.status == 'published' and target.category_id:
+        _shift_category_count(connection, target.category_id, -1)
+
+@event.listens_for(Post, 'before_update')
+def move_category_post_count(mapper, connection, target):
+    """Follow status and category transitions on update
+
+    Attribute history can't supply the old values (the attributes are
+    usually expired after the previous commit), so when status or
+    category_id was touched the pre-update row is read back with one
+    point SELECT before the UPDATE overwrites it; a publish, unpublish
+    or recategorization then adjusts exactly the categories whose
+    published count actually changed.
+    """
+    from sqlalchemy.orm.attributes import get_history
+    if not (get_history(target, 'status').has_changes()
+            or get_history(target, 'category_id').has_changes()):
+        return
+    row = connection.execute(
+        db.select(Post.status, Post.category_id)
+        .where(Post.id == target.id)).first()
+    if row is None:
+        return
+    was_counted = (row.status == 'published', row.category_id)
+    now_counted = (target.status == 'published', target.category_id)
+    if was_counted == now_counted:
+        return
+    if was_counted[0] and was_counted[1]:
+        _shift_category_count(connection, was_counted[1], -1)
+    if now_counted[0] and now_counted[1]:
+        _shift_category_count(connection, now_counted[1], 1)
+
+@event.listens_for(Post.tags, 'append')
+def bump_tag_use_count(target, value, initiator):
+    """Maintain Tag.use_count as tags are attached to posts"""
+    value.use_count = (value.use_count or 0) + 1
+
+@event.listens_for(Post.tags, 'remove')
+def drop_tag_use_count(target, value, initiator):
+    """Maintain Tag.use_count as tags are detached from posts"""
+    if value.use_count:
+        value.use_count = value.use_count - 1
+
+@event.listens_for(Post, 'after_insert')
+@event.listens_for(Post, 'after_update')
+@event.listens_for(Post, 'after_delete')
+def invalidate_post_caches(mapper, connection, target):
+    """Drop per-tenant caches derived from the post set when posts change"""
+    from app import cache, invalidate_post_lists
+    cache.delete_many(
+        f'dash:stats:{target.tenant_id}',
+        f'sitemap:{target.tenant_id}',
+        f'feed:{target.tenant_id}',
+        f'archive:{target.tenant_id}',
+    )
+    # Bump the list version so versioned keys (API lists, anonymous page
+    # cache) roll over without pattern deletes
+    invalidate_post_lists(target.tenant_id)
\ No newline at end of file
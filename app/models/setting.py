@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import event
 from app import db
 from app.utils.tenant import TenantMixin
 
@@ -22,6 +23,9 @@ class Setting(TenantMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Relationships
+    tenant = db.relationship('Tenant', back_populates='settings')
+
     # Unique constraint for key per tenant
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'key', name='_tenant_setting_key_uc'),
@@ -81,6 +85,14 @@ class Setting(TenantMixin, db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+@event.listens_for(Setting, 'after_insert')
+@event.listens_for(Setting, 'after_update')
+@event.listens_for(Setting, 'after_delete')
+def invalidate_setting_caches(mapper, connection, target):
+    """Drop the cached per-tenant settings dict when a setting changes"""
+    from app import invalidate_tenant_globals
+    invalidate_tenant_globals(target.tenant_id)
+
 class Comment(TenantMixin, db.Model):
     """Comment model for blog posts"""
     __tablename__ = 'comments'
@@ -109,12 +121,35 @@ class Comment(TenantMixin, db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    author = db.relationship('User', backref='comments')
-    replies = db.relationship('Comment', backref=db.backref('parent_comment', remote_side=[id]), lazy='dynamic')
+    author = db.relationship('User', back_populates='comments')
+    post = db.relationship('Post', back_populates='comments')
+    replies = db.relationship('Comment', back_populates='parent_comment')
+    parent_comment = db.relationship('Comment', back_populates='replies', remote_side=[id])
     
     def __repr__(self):
         return f'<Comment by {self.author_name}>'
-    
+
+    @classmethod
+    def thread_for_post(cls, post_id):
+        """Approved comments of a post with reply counts preloaded
+
+        Fetches the thread in one query (authors joined for the avatar
+        and display-name renders) and fills _reply_count from a single
+        grouped count, so serializing N comments doesn't fire N COUNT
+        queries against the replies collection.
+        """
+        from sqlalchemy.orm import joinedload
+        comments = cls.query.options(joinedload(cls.author))\
+            .filter_by(post_id=post_id, is_approved=True)\
+            .order_by(cls.created_at).all()
+        counts = dict(db.session.execute(
+            db.select(cls.parent_id, db.func.count(cls.id))
+            .where(cls.post_id == post_id, cls.parent_id.isnot(None))
+            .group_by(cls.parent_id)).all())
+        for comment in comments:
+            comment._reply_count = counts.get(comment.id, 0)
+        return comments
+
     @property
     def is_guest(self):
         """Check if comment is from a guest user"""
@@ -132,10 +167,10 @@ class Comment(TenantMixin, db.Model):
         """Get author avatar URL"""
         if self.author:
             return self.author.get_avatar_url(40)
-        
-        # Fallback to Gravatar for guest users
-        import hashlib
-        email_hash = hashlib.md5(self.author_email.lower().encode('utf-8')).hexdigest()
+
+        # Fallback to Gravatar for guest users (hash cached per email)
+        from app.utils.helpers import gravatar_hash
+        email_hash = gravatar_hash(self.author_email.lower())
         return f"https://www.gravatar.com/avatar/{email_hash}?s=40&d=identicon"
     
     def approve(self):
@@ -167,5 +202,13 @@ class Comment(TenantMixin, db.Model):
             'is_approved': self.is_approved,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'parent_id': self.parent_id,
-            'reply_count': self.replies.count()
-        }
\ No newline at end of file
+            'reply_count': self.reply_count
+        }
+
+    @property
+    def reply_count(self):
+        """Number of replies, preferring the batch-loaded value"""
+        preloaded = getattr(self, '_reply_count', None)
+        if preloaded is not None:
+            return preloaded
+        return len(self.replies)
\ No newline at end of file
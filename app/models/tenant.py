@@ -39,13 +39,15 @@ class Tenant(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    users = db.relationship('User', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
-    posts = db.relationship('Post', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
-    categories = db.relationship('Category', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
-    tags = db.relationship('Tag', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
-    media_files = db.relationship('MediaFile', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
-    settings = db.relationship('Setting', backref='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    # Relationships (explicit back_populates; the collections stay
+    # lazy='dynamic' because they are unbounded per tenant and only
+    # exist as cascade containers)
+    users = db.relationship('User', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    posts = db.relationship('Post', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    categories = db.relationship('Category', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    tags = db.relationship('Tag', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    media_files = db.relationship('MediaFile', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
+    settings = db.relationship('Setting', back_populates='tenant', lazy='dynamic', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Tenant {self.subdomain}>'
@@ -65,12 +67,31 @@ class Tenant(db.Model):
         return f"https://{self.full_domain}"
     
     def get_setting(self, key, default=None):
-        """Get a setting value for this tenant"""
-        setting = Setting.query.filter_by(tenant_id=self.id, key=key).first()
-        return setting.value if setting else default
-    
+        """Get a setting value for this tenant
+
+        The memoized per-tenant settings dict is pinned on flask.g for
+        the rest of the request, so a template that reads a dozen
+        settings pays one cache GET (and unpickle) instead of twelve.
+        Writes invalidate the backing cache via the Setting events in
+        models/setting.py; set_setting below drops the g pin so the
+        same request re-reads fresh values.
+        """
+        from flask import g, has_app_context
+        from app import _load_tenant_globals
+        if has_app_context():
+            store = g.setdefault('_tenant_settings', {})
+            settings = store.get(self.id)
+            if settings is None:
+                settings = store[self.id] = _load_tenant_globals(self.id)[0]
+        else:
+            settings = _load_tenant_globals(self.id)[0]
+        return settings.get(key, default)
+
     def set_setting(self, key, value):
         """Set a setting value for this tenant"""
+        from flask import g, has_app_context
+        if has_app_context():
+            g.setdefault('_tenant_settings', {}).pop(self.id, None)
         setting = Setting.query.filter_by(tenant_id=self.id, key=key).first()
         if setting:
             setting.value = value
@@ -95,6 +116,24 @@ class Tenant(db.Model):
             'full_domain': self.full_domain
         }
 
+@event.listens_for(Tenant, 'after_update')
+@event.listens_for(Tenant, 'after_delete')
+def drop_tenant_subdomain_index(mapper, connection, target):
+    """Drop the cached subdomain -> id mapping when a tenant changes"""
+    from app import cache
+    cache.delete(f'tenant_id:{target.subdomain}')
+
+@event.listens_for(Tenant.__table__, 'after_create')
+def create_tenant_search_index(target, connection, **kw):
+    """Create a trigram index backing the admin tenant search (Postgres only)"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy import text
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS tenants_search_trgm ON tenants "
+            "USING gin ((name || ' ' || subdomain || ' ' || coalesce(title, '')) gin_trgm_ops)"
+        ))
+
 # Import models to establish relationships
 from app.models.user import User
 from app.models.post import Post
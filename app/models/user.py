@@ -1,5 +1,6 @@
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 from app.utils.tenant import TenantMixin
@@ -31,8 +32,10 @@ class User(UserMixin, TenantMixin, db.Model):
     email_verified = db.Column(db.Boolean, default=False)
     email_verification_token = db.Column(db.String(100), nullable=True)
     
-    # Password reset
-    password_reset_token = db.Column(db.String(100), nullable=True)
+    # Password reset: only the sha256 of the token is stored, so a DB
+    # dump never yields usable reset links; indexed for the O(log n)
+    # lookup in reset_password
+    password_reset_token_hash = db.Column(db.String(64), nullable=True, index=True)
     password_reset_expires = db.Column(db.DateTime, nullable=True)
     
     # Timestamps
@@ -41,8 +44,10 @@ class User(UserMixin, TenantMixin, db.Model):
     last_login = db.Column(db.DateTime, nullable=True)
     
     # Relationships
-    posts = db.relationship('Post', backref='author', lazy='dynamic')
-    media_files = db.relationship('MediaFile', backref='uploaded_by_user', lazy='dynamic')
+    tenant = db.relationship('Tenant', back_populates='users')
+    posts = db.relationship('Post', back_populates='author')
+    media_files = db.relationship('MediaFile', back_populates='uploaded_by_user')
+    comments = db.relationship('Comment', back_populates='author')
     
     # Unique constraint for email per tenant
     __table_args__ = (
@@ -52,14 +57,57 @@ class User(UserMixin, TenantMixin, db.Model):
     
     def __repr__(self):
         return f'<User {self.email}>'
-    
+
+    @classmethod
+    def get_by_email_cached(cls, tenant_id, email):
+        """Resolve a user by email via the cached id index
+
+        The cache stores only the id (kept fresh by the events below);
+        the row itself comes from db.session.get so the identity map and
+        lazy loading behave normally. Falls back to the indexed query on
+        a miss or a stale entry.
+        """
+        from app import cache
+
+        email = email.strip().lower()
+        key = f'user_id:{tenant_id}:{email}'
+
+        user_id = cache.get(key)
+        if user_id is not None:
+            user = db.session.get(cls, user_id)
+            if user and user.tenant_id == tenant_id and user.email.lower() == email:
+                return user
+            cache.delete(key)
+
+        user = cls.query.filter_by(tenant_id=tenant_id, email=email).first()
+        if user:
+            cache.set(key, user.id, timeout=3600)
+        return user
+
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
-    
+        from flask import current_app
+        method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        self.password_hash = generate_password_hash(password, method=method)
+
     def check_password(self, password):
         """Check password"""
         return check_password_hash(self.password_hash, password)
+
+    def upgrade_password_hash(self, password):
+        """Re-hash after a successful login if the stored hash is stale
+
+        Werkzeug hashes carry their method and cost as a prefix
+        (method$salt$hash), so a scheme or cost change is detected by
+        comparing the prefix against the configured method. Returns
+        True when the hash was upgraded so callers know to commit.
+        """
+        from flask import current_app
+        method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        if not self.password_hash.startswith(f'{method}$'):
+            self.set_password(password)
+            return True
+        return False
     
     @property
     def full_name(self):
@@ -102,10 +150,10 @@ class User(UserMixin, TenantMixin, db.Model):
         """Get avatar URL with fallback to Gravatar"""
         if self.avatar_url:
             return self.avatar_url
-        
-        # Fallback to Gravatar
-        import hashlib
-        email_hash = hashlib.md5(self.email.lower().encode('utf-8')).hexdigest()
+
+        # Fallback to Gravatar (hash cached per email)
+        from app.utils.helpers import gravatar_hash
+        email_hash = gravatar_hash(self.email.lower())
         return f"https://www.gravatar.com/avatar/{email_hash}?s={size}&d=identicon"
     
     def to_dict(self):
@@ -126,4 +174,18 @@ class User(UserMixin, TenantMixin, db.Model):
             'email_verified': self.email_verified,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'last_login': self.last_login.isoformat() if self.last_login else None
-        }
\ No newline at end of file
+        }
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+def refresh_user_email_index(mapper, connection, target):
+    """Keep the email -> id cache index in step with the row"""
+    from app import cache
+    cache.set(f'user_id:{target.tenant_id}:{target.email.lower()}',
+              target.id, timeout=3600)
+
+@event.listens_for(User, 'after_delete')
+def drop_user_email_index(mapper, connection, target):
+    """Drop the email -> id cache index entry with the row"""
+    from app import cache
+    cache.delete(f'user_id:{target.tenant_id}:{target.email.lower()}')
\ No newline at end of file
@@ -3,14 +3,18 @@ Auth Module - Handles authentication, user management, and session management
 Modular design inspired by Astro's approach
 """
 
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, session
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, session, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import re
 
-from app import db
+from app import db, cache, limiter
 from app.models import User
+from app.utils.security import (safe_redirect_target, verify_password_pooled,
+                                complete_login)
+
+_URL_SCHEMES = ('http://', 'https://')
 
 class AuthModule:
     """Auth module with clean separation of concerns"""
@@ -21,7 +25,12 @@ class AuthModule:
     
     def _register_routes(self):
         """Register all auth routes"""
-        self.blueprint.add_url_rule('/login', 'login', self.login, methods=['GET', 'POST'])
+        # Brute-force guard ahead of the expensive password hash; with
+        # Redis storage this is an atomic INCR+EXPIRE per window
+        self.blueprint.add_url_rule(
+            '/login', 'login',
+            limiter.limit('10 per minute', methods=['POST'])(self.login),
+            methods=['GET', 'POST'])
         self.blueprint.add_url_rule('/register', 'register', self.register, methods=['GET', 'POST'])
         self.blueprint.add_url_rule('/logout', 'logout', self.logout)
         self.blueprint.add_url_rule('/profile', 'profile', self.profile, methods=['GET', 'POST'])
@@ -37,7 +46,10 @@ class AuthModule:
             result = self._authenticate_user(data['email'], data['password'], data.get('remember', False))
             
             if result['success']:
-                return redirect(request.args.get('next') or url_for('dashboard.index'))
+                next_page = safe_redirect_target(request.args.get('next'))
+                if next_page:
+                    return redirect(next_page)
+                return redirect(url_for('dashboard.index'))
             else:
                 flash(result['message'], 'error')
         
@@ -119,11 +131,9 @@ class AuthModule:
             return {'success': False, 'message': 'Please provide both email and password.'}
         
         user = User.query.filter_by(email=email, is_active=True).first()
-        
-        if user and user.check_password(password):
-            login_user(user, remember=remember)
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+
+        if user and verify_password_pooled(user, password):
+            complete_login(user, remember=remember, password=password)
             return {'success': True, 'user': user}
         
         return {'success': False, 'message': 'Invalid email or password.'}
@@ -152,11 +162,17 @@ class AuthModule:
         if not re.match(r'^[a-zA-Z0-9_]+$', data['username']):
             return {'success': False, 'message': 'Username can only contain letters, numbers, and underscores.'}
         
-        # Check if email or username already exists
-        if User.query.filter_by(email=data['email']).first():
+        # Check email and username availability in one round-trip
+        from sqlalchemy import select, exists
+        row = db.session.execute(select(
+            exists().where(User.email == data['email']).label('email_taken'),
+            exists().where(User.username == data['username']).label('username_taken'),
+        )).one()
+
+        if row.email_taken:
             return {'success': False, 'message': 'Email address already registered.'}
-        
-        if User.query.filter_by(username=data['username']).first():
+
+        if row.username_taken:
             return {'success': False, 'message': 'Username already taken.'}
         
         try:
@@ -188,15 +204,16 @@ class AuthModule:
             
             # Validate and set website URL
             website_url = data.get('website_url', '')
-            if website_url and not website_url.startswith(('http://', 'https://')):
+            if website_url and not website_url.startswith(_URL_SCHEMES):
                 website_url = 'https://' + website_url
             user.website_url = website_url
             
             user.updated_at = datetime.utcnow()
             db.session.commit()
-            
+            cache.delete(f'user:{user.id}')
+
             return {'success': True}
-            
+
         except Exception as e:
             db.session.rollback()
             return {'success': False, 'message': 'An error occurred updating your profile.'}
@@ -219,7 +236,8 @@ class AuthModule:
             user.set_password(data['new_password'])
             user.updated_at = datetime.utcnow()
             db.session.commit()
-            
+            cache.delete(f'user:{user.id}')
+
             return {'success': True}
             
         except Exception as e:
@@ -5,10 +5,12 @@ Modular design inspired by Astro's approach
 
 from flask import Blueprint, request, render_template, abort, jsonify
 from sqlalchemy import desc, or_
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime
 
 from app import db
 from app.models import Post, Category, Tag, Comment
+from app.utils.pagination import paginate_fast
 
 class BlogModule:
     """Blog module for public-facing blog functionality"""
@@ -17,6 +19,16 @@ class BlogModule:
         self.blueprint = Blueprint('blog', __name__)
         self._register_routes()
     
+    @staticmethod
+    def _listing_options():
+        """Loader options for post listings
+
+        Templates walk author, category and tags per card; eager-loading
+        keeps a page at a fixed handful of queries instead of 3 per row.
+        """
+        return (joinedload(Post.author), joinedload(Post.category),
+                selectinload(Post.tags))
+
     def _register_routes(self):
         """Register all blog routes"""
         self.blueprint.add_url_rule('/', 'index', self.index)
@@ -32,10 +44,10 @@ class BlogModule:
         page = request.args.get('page', 1, type=int)
         per_page = 6  # Number of posts per page
         
-        posts_query = Post.query.filter_by(status='published').order_by(desc(Post.published_at))
-        posts = posts_query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        posts_query = Post.query.filter_by(status='published')\
+            .options(*self._listing_options())\
+            .order_by(desc(Post.published_at))
+        posts = paginate_fast(posts_query, Post.id, page, per_page)
         
         # Get featured post
         featured_post = Post.query.filter_by(
@@ -46,10 +58,8 @@ class BlogModule:
         # Get categories for navigation
         categories = Category.query.filter_by(is_active=True).order_by(Category.sort_order).all()
         
-        # Get recent posts for sidebar
-        recent_posts = Post.query.filter_by(status='published').order_by(
-            desc(Post.published_at)
-        ).limit(5).all()
+        # Get recent posts for sidebar (cached lambda statement)
+        recent_posts = Post.recent_published(limit=5)
         
         return render_template('components/blog/index.html',
                              posts=posts,
@@ -59,7 +69,8 @@ class BlogModule:
     
     def post(self, slug):
         """Individual post page"""
-        post = Post.query.filter_by(slug=slug, status='published').first_or_404()
+        post = Post.query.options(*self._listing_options())\
+                         .filter_by(slug=slug, status='published').first_or_404()
         
         # Increment view count
         post.increment_view_count()
@@ -71,12 +82,9 @@ class BlogModule:
             Post.status == 'published'
         ).order_by(desc(Post.published_at)).limit(3).all()
         
-        # Get approved comments
-        comments = Comment.query.filter_by(
-            post_id=post.id,
-            is_approved=True
-        ).order_by(Comment.created_at).all()
-        
+        # Get approved comments with reply counts batch-loaded
+        comments = Comment.thread_for_post(post.id)
+
         return render_template('components/blog/post.html',
                              post=post,
                              related_posts=related_posts,
@@ -89,12 +97,11 @@ class BlogModule:
         page = request.args.get('page', 1, type=int)
         per_page = 6
         
-        posts = Post.query.filter_by(
+        posts = paginate_fast(Post.query.filter_by(
             category_id=category.id,
             status='published'
-        ).order_by(desc(Post.published_at)).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        ).options(*self._listing_options())
+         .order_by(desc(Post.published_at)), Post.id, page, per_page)
         
         return render_template('components/blog/category.html',
                              category=category,
@@ -107,12 +114,16 @@ class BlogModule:
         page = request.args.get('page', 1, type=int)
         per_page = 6
         
-        posts = Post.query.filter(
-            Post.tags.contains(tag),
+        # Explicit association-table join keeps the lookup on the
+        # (tag_id, post_id) index rather than a per-row EXISTS
+        from app.models.post import post_tags
+        posts = paginate_fast(Post.query.join(
+            post_tags, db.and_(post_tags.c.post_id == Post.id,
+                               post_tags.c.tag_id == tag.id)
+        ).filter(
             Post.status == 'published'
-        ).order_by(desc(Post.published_at)).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        ).options(*self._listing_options())
+         .order_by(desc(Post.published_at)), Post.id, page, per_page)
         
         return render_template('components/blog/tag.html',
                              tag=tag,
@@ -125,18 +136,23 @@ class BlogModule:
         per_page = 6
         
         posts = None
+        if query and len(query) < 3:
+            # A one-character needle LIKE-matches most of the table;
+            # refuse rather than seqscan-and-sort per request
+            return render_template('components/blog/search.html',
+                                   query=query, posts=None,
+                                   error='Search term must be at least 3 characters')
         if query:
             # Search in title, content, and excerpt
-            posts = Post.query.filter(
+            posts = paginate_fast(Post.query.filter(
                 Post.status == 'published',
                 or_(
                     Post.title.contains(query),
                     Post.content.contains(query),
                     Post.excerpt.contains(query)
                 )
-            ).order_by(desc(Post.published_at)).paginate(
-                page=page, per_page=per_page, error_out=False
-            )
+            ).options(*self._listing_options())
+             .order_by(desc(Post.published_at)), Post.id, page, per_page)
         
         return render_template('components/blog/search.html',
                              query=query,
@@ -156,7 +172,12 @@ class BlogModule:
     
     def sitemap(self):
         """Generate XML sitemap"""
-        posts = Post.query.filter_by(status='published').all()
+        from sqlalchemy.orm import load_only
+        # Only slug/updated_at/published_at reach the template; batch
+        # the fetch so a large blog doesn't materialize every row
+        posts = Post.query.filter_by(status='published')\
+            .options(load_only(Post.slug, Post.updated_at, Post.published_at))\
+            .yield_per(500)
         categories = Category.query.filter_by(is_active=True).all()
         tags = Tag.query.all()
         
@@ -180,9 +201,7 @@ class BlogModule:
     
     def get_recent_posts(self, limit=5):
         """Get recent published posts"""
-        return Post.query.filter_by(status='published').order_by(
-            desc(Post.published_at)
-        ).limit(limit).all()
+        return Post.recent_published(limit=limit)
     
     def get_popular_posts(self, limit=5):
         """Get popular posts by view count"""
@@ -5,12 +5,14 @@ Modular design inspired by Astro's approach
 
 from flask import Blueprint, request, render_template, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 import os
 import re
 
 from app import db
 from app.models import Post, Category, Tag, Comment, MediaFile, Setting
+from app.utils.pagination import paginate_fast
 
 def slugify(text):
     """Simple slugify function"""
@@ -81,9 +83,10 @@ class DashboardModule:
         if status != 'all':
             query = query.filter_by(status=status)
         
-        posts = query.order_by(Post.updated_at.desc()).paginate(
-            page=page, per_page=10, error_out=False
-        )
+        posts = paginate_fast(
+            query.options(joinedload(Post.author), joinedload(Post.category))
+                 .order_by(Post.updated_at.desc()),
+            Post.id, page, 10)
         
         return render_template('components/dashboard/posts.html',
                              posts=posts,
@@ -168,6 +171,11 @@ class DashboardModule:
             Post.query.filter_by(category_id=id).update({'category_id': None})
             db.session.delete(category)
             db.session.commit()
+
+            # Drop the cached navigation categories
+            from app import invalidate_tenant_globals
+            invalidate_tenant_globals()
+
             flash('Category deleted successfully!', 'success')
         except Exception as e:
             db.session.rollback()
@@ -180,9 +188,9 @@ class DashboardModule:
         """Media library"""
         page = request.args.get('page', 1, type=int)
         
-        media_files = MediaFile.query.order_by(MediaFile.created_at.desc()).paginate(
-            page=page, per_page=20, error_out=False
-        )
+        media_files = paginate_fast(
+            MediaFile.query.order_by(MediaFile.created_at.desc()),
+            MediaFile.id, page, 20)
         
         return render_template('components/dashboard/media.html',
                              media_files=media_files)
@@ -231,9 +239,10 @@ class DashboardModule:
         elif status == 'approved':
             query = query.filter_by(is_approved=True)
         
-        comments = query.order_by(Comment.created_at.desc()).paginate(
-            page=page, per_page=10, error_out=False
-        )
+        comments = paginate_fast(
+            query.options(joinedload(Comment.author), joinedload(Comment.post))
+                 .order_by(Comment.created_at.desc()),
+            Comment.id, page, 10)
         
         return render_template('components/dashboard/comments.html',
                              comments=comments,
@@ -290,16 +299,30 @@ class DashboardModule:
                              settings=settings)
     
     def _get_dashboard_stats(self):
-        """Get dashboard statistics"""
+        """Get dashboard statistics
+
+        Conditional aggregation folds the per-status counts and the view
+        sum into one scan per table instead of a round trip per number.
+        """
+        post_row = db.session.query(
+            db.func.count(Post.id),
+            db.func.sum(db.case((Post.status == 'published', 1), else_=0)),
+            db.func.sum(db.case((Post.status == 'draft', 1), else_=0)),
+            db.func.coalesce(db.func.sum(Post.view_count), 0),
+        ).one()
+        comment_row = db.session.query(
+            db.func.count(Comment.id),
+            db.func.sum(db.case((db.not_(Comment.is_approved), 1), else_=0)),
+        ).one()
         return {
-            'total_posts': Post.query.count(),
-            'published_posts': Post.query.filter_by(status='published').count(),
-            'draft_posts': Post.query.filter_by(status='draft').count(),
+            'total_posts': int(post_row[0] or 0),
+            'published_posts': int(post_row[1] or 0),
+            'draft_posts': int(post_row[2] or 0),
             'total_categories': Category.query.count(),
-            'total_comments': Comment.query.count(),
-            'pending_comments': Comment.query.filter_by(is_approved=False).count(),
+            'total_comments': int(comment_row[0] or 0),
+            'pending_comments': int(comment_row[1] or 0),
             'total_media': MediaFile.query.count(),
-            'total_views': db.session.query(db.func.sum(Post.view_count)).scalar() or 0
+            'total_views': int(post_row[3] or 0)
         }
     
     def _save_post(self, post, form_data):
@@ -345,6 +368,14 @@ class DashboardModule:
             self._update_post_tags(post, form_data.get('tags', ''))
             
             db.session.commit()
+
+            from app import cache, invalidate_post_lists
+            from app.utils.tenant import get_current_tenant
+            tenant = get_current_tenant()
+            if tenant:
+                cache.delete(f'stats:{tenant.id}')
+                invalidate_post_lists(tenant.id)
+
             return {'success': True, 'post': post}
             
         except Exception as e:
@@ -352,18 +383,12 @@ class DashboardModule:
             return {'success': False, 'message': f'Error saving post: {str(e)}'}
     
     def _update_post_tags(self, post, tags_string):
-        """Update post tags"""
-        # Clear existing tags
-        post.tags.clear()
-        
-        if tags_string:
-            tag_names = [tag.strip() for tag in tags_string.split(',') if tag.strip()]
-            for tag_name in tag_names:
-                tag = Tag.query.filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name, slug=slugify(tag_name))
-                    db.session.add(tag)
-                post.tags.append(tag)
+        """Update post tags (batched find-or-create)"""
+        from app.utils.helpers import sync_post_tags
+        from app.utils.tenant import get_current_tenant
+
+        tenant = get_current_tenant()
+        sync_post_tags(post, tenant.id if tenant else post.tenant_id, tags_string)
     
     def _save_category(self, form_data):
         """Save category data"""
@@ -378,6 +403,11 @@ class DashboardModule:
             
             db.session.add(category)
             db.session.commit()
+
+            # Drop the cached navigation categories
+            from app import invalidate_tenant_globals
+            invalidate_tenant_globals()
+
             return {'success': True}
             
         except Exception as e:
@@ -415,7 +445,11 @@ class DashboardModule:
             for key in settings_to_save:
                 value = form_data.get(key, '')
                 Setting.set_value(key, value)
-            
+
+            # Drop the cached settings dict used by the context processor
+            from app import invalidate_tenant_globals
+            invalidate_tenant_globals()
+
             return {'success': True}
             
         except Exception as e:
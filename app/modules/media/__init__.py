@@ -6,6 +6,7 @@ Modular design inspired by Astro's approach
 from flask import Blueprint, request, jsonify, current_app, url_for
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
+from concurrent.futures import ThreadPoolExecutor
 import os
 import uuid
 from datetime import datetime
@@ -14,12 +15,18 @@ import mimetypes
 
 from app import db
 from app.models import MediaFile
+from app.utils.helpers import save_upload
+from app.utils.pagination import paginate_fast
 
 class MediaModule:
     """Media module for file upload and management"""
     
     def __init__(self):
         self.blueprint = Blueprint('media', __name__)
+        # Thumbnailing decodes the full image; run it off the request
+        # thread so large uploads don't block the WSGI worker
+        self.thumb_pool = ThreadPoolExecutor(max_workers=2,
+                                             thread_name_prefix='thumb')
         self.allowed_extensions = {
             'images': {'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'},
             'documents': {'pdf', 'doc', 'docx', 'txt', 'rtf'},
@@ -78,9 +85,8 @@ class MediaModule:
             elif file_type == 'documents':
                 query = query.filter(MediaFile.mime_type.startswith('application/'))
         
-        media_files = query.order_by(MediaFile.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        media_files = paginate_fast(query.order_by(MediaFile.created_at.desc()),
+                                    MediaFile.id, page, per_page)
         
         return jsonify({
             'success': True,
@@ -196,22 +202,24 @@ class MediaModule:
             os.makedirs(upload_dir, exist_ok=True)
             
             file_path = os.path.join(upload_dir, unique_filename)
-            
-            # Save file
-            file.save(file_path)
-            
+
+            # Save file (streamed; constant memory regardless of size)
+            file_size = save_upload(file, file_path)
+
             # Get file info
-            file_size = os.path.getsize(file_path)
             mime_type = mimetypes.guess_type(file_path)[0] or file.content_type
             
-            # Process image if applicable
+            # Process image if applicable; draft() keeps the size read
+            # header-only (no pixel decode) and the thumbnail is built
+            # on the background pool
             width, height = None, None
             if mime_type and mime_type.startswith('image/'):
                 try:
                     with Image.open(file_path) as img:
+                        img.draft('RGB', (1, 1))
                         width, height = img.size
-                        # Create thumbnail
-                        self._create_thumbnail(file_path, unique_filename)
+                    self.thumb_pool.submit(self._create_thumbnail,
+                                           file_path, unique_filename)
                 except Exception:
                     pass  # Not a valid image or PIL not available
             
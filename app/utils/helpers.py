@@ -1,13 +1,74 @@
+import hashlib
+import io
 import os
+import re
+import shutil
+import string
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
 from werkzeug.utils import secure_filename
 from PIL import Image
 import uuid
 from flask import current_app
 
+# Translation table for slugify: allowed characters map through, every
+# other codepoint maps to '-'. defaultdict makes str.translate treat
+# "not listed" as "replace", so the whole scan happens in C
+_SLUG_TABLE = defaultdict(lambda: ord('-'),
+                          {ord(c): c for c in
+                           string.ascii_lowercase + string.digits + '-'})
+_DASH_RUN = re.compile(r'-+')
+
+def slugify(text, limit=200):
+    """Turn a title into a URL slug in a single C-level pass
+
+    NFKD-normalizing first folds accented characters to their ascii
+    base instead of dropping them; str.translate with the precomputed
+    table then replaces everything non-slug-safe in one scan, and a
+    final regex collapses dash runs. Used by the before_insert slug
+    listeners on Post, Category and Tag.
+    """
+    text = unicodedata.normalize('NFKD', text)\
+        .encode('ascii', 'ignore').decode()
+    slug = text.lower().translate(_SLUG_TABLE)
+    return _DASH_RUN.sub('-', slug).strip('-')[:limit]
+
+@lru_cache(maxsize=8192)
+def gravatar_hash(email_lower):
+    """MD5 of a lowercased email for Gravatar URLs, cached
+
+    A comment page hashes the same few commenter emails over and over;
+    the bounded LRU turns repeats into a dict lookup. Callers must
+    lowercase the email so variants share an entry.
+    """
+    return hashlib.md5(email_lower.encode('utf-8')).hexdigest()
+
+def save_upload(file, file_path):
+    """Stream an uploaded file to disk without buffering it in memory
+
+    file.save() pulls the whole spooled upload through userspace before
+    writing. When the spool has rolled over to a real file, os.sendfile
+    copies kernel-to-kernel instead; otherwise a 1MB chunked copy keeps
+    the memory ceiling constant. Returns the number of bytes written.
+    """
+    with open(file_path, 'wb') as dst:
+        try:
+            size = os.fstat(file.stream.fileno()).st_size
+            sent = 0
+            while sent < size:
+                sent += os.sendfile(dst.fileno(), file.stream.fileno(),
+                                    sent, size - sent)
+            return sent
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            file.stream.seek(0)
+            shutil.copyfileobj(file.stream, dst, length=1 << 20)
+            return dst.tell()
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+    ext = os.path.splitext(filename)[1][1:].lower()
+    return bool(ext) and ext in current_app.config['ALLOWED_EXTENSIONS']
 
 def generate_unique_filename(original_filename):
     """Generate unique filename while preserving extension"""
@@ -111,4 +172,69 @@ def extract_excerpt(content, length=160):
     if last_space > 0:
         excerpt = excerpt[:last_space]
     
-    return excerpt + '...'
\ No newline at end of file
+    return excerpt + '...'
+def active_categories(tenant_id):
+    """Serialized active categories for a tenant, cached
+
+    Every public page and the post forms render this list and categories
+    change rarely. Plain dicts (not ORM rows) keep the cache payload
+    cheap to pickle and immune to detached-instance errors; the key is
+    shared with the categories API so invalidate_tenant_globals drops
+    both at once.
+    """
+    from app import cache
+    from app.models import Category
+
+    cache_key = f'categories:{tenant_id}'
+    payload = cache.get(cache_key)
+    if payload is None:
+        # Published counts come from the denormalized Category.post_count
+        # column, so this is a single plain scan of the category rows
+        categories = Category.query\
+            .filter(Category.tenant_id == tenant_id,
+                    Category.is_active == True)\
+            .order_by(Category.sort_order, Category.name).all()
+        payload = {
+            'categories': [category.to_dict() for category in categories]
+        }
+        cache.set(cache_key, payload, timeout=300)
+    return payload['categories']
+
+def sync_post_tags(post, tenant_id, tags_input):
+    """Replace a post's tags from a comma-separated input string
+
+    Diffs against the post's current tags: an edit that keeps the tags
+    unchanged issues zero tag statements, and only names the post
+    doesn't already carry are looked up (one IN SELECT) or created (one
+    add_all). Slugs for new tags come from the Tag before_insert
+    listener.
+    """
+    from app import db
+    from app.models import Tag
+
+    names = []
+    seen = set()
+    for name in (tags_input or '').split(','):
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+
+    if not names:
+        post.tags = []
+        return
+
+    current = {tag.name: tag for tag in post.tags}
+    if set(names) == set(current):
+        return
+
+    missing = [name for name in names if name not in current]
+    existing = {}
+    if missing:
+        existing = {tag.name: tag for tag in Tag.query.filter(
+            Tag.tenant_id == tenant_id, Tag.name.in_(missing)).all()}
+    new_tags = {name: Tag(tenant_id=tenant_id, name=name)
+                for name in missing if name not in existing}
+    db.session.add_all(new_tags.values())
+    post.tags = [current.get(name) or existing.get(name) or new_tags[name]
+                 for name in names]
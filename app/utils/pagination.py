@@ -0,0 +1,92 @@
+"""Keyset (seek) pagination helpers"""
+from datetime import datetime
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import func, tuple_
+
+
+def paginate_fast(query, count_col, page, per_page, error_out=False):
+    """OFFSET pagination with a lean COUNT leg
+
+    paginate()'s built-in count wraps the full SELECT - every projected
+    column plus its ORDER BY - in a subquery. Counting the filtered set
+    directly as count(<pk>) with the ordering stripped lets the planner
+    use an index-only scan.
+    """
+    items = query.paginate(page=page, per_page=per_page,
+                           error_out=error_out, count=False)
+    items.total = query.order_by(None)\
+                       .with_entities(func.count(count_col)).scalar()
+    return items
+
+
+class KeysetPage:
+    """One page of a keyset-paginated query
+
+    Exposes the attributes list templates use (items, has_next) plus an
+    opaque next_cursor for the "older" link. Unlike OFFSET pagination
+    there is no page count: the extra fetched row answers has_next
+    without a COUNT(*) round-trip.
+    """
+
+    def __init__(self, items, has_next, next_cursor):
+        self.items = items
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'],
+                             salt='keyset-cursor')
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+def keyset_paginate(query, columns, per_page, cursor=None):
+    """Fetch one page ordered by `columns` descending
+
+    `columns` are the sort columns with a unique tie-breaker last, e.g.
+    (Post.published_at, Post.id). The cursor is the signed value tuple
+    of the last row on the previous page; the row-value comparison
+    `(cols) < (cursor)` seeks straight to the page via the matching
+    index instead of scanning and discarding OFFSET rows. A tampered or
+    stale cursor silently falls back to the first page.
+    """
+    query = query.order_by(*[col.desc() for col in columns])
+
+    if cursor:
+        try:
+            values = _serializer().loads(cursor)
+            query = query.filter(
+                tuple_(*columns) < tuple(_decode_value(v) for v in values))
+        except BadSignature:
+            pass
+
+    rows = query.limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = _serializer().dumps(
+            [_encode_value(getattr(last, col.key)) for col in columns])
+
+    return KeysetPage(items, has_next, next_cursor)
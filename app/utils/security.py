@@ -0,0 +1,44 @@
+import re
+from datetime import datetime
+
+from flask import current_app
+from flask_login import login_user
+from werkzeug.security import check_password_hash
+
+from app import db
+
+# Relative paths only; the lookahead also rejects scheme-relative
+# //evil.com redirects, which a bare startswith('/') check lets
+# through, and /\evil.com (browsers normalize the backslash to /)
+_SAFE_NEXT = re.compile(r'^/(?![/\\])[^\s]*$')
+
+def safe_redirect_target(next_page):
+    """Return next_page if it is a safe same-site path, else None
+
+    Shared by both auth blueprint variants so the redirect policy
+    can't drift between them.
+    """
+    if next_page and _SAFE_NEXT.match(next_page):
+        return next_page
+    return None
+
+def verify_password_pooled(user, password):
+    """Check a password against the user's stored hash on the hash pool
+
+    Verification runs on the app's hash pool so the worker thread
+    isn't pinned for the full hash cost; the stored hash is read here
+    so the pool thread never touches the session or app context.
+    """
+    return current_app.hash_pool.submit(
+        check_password_hash, user.password_hash, password).result()
+
+def complete_login(user, password, remember=False):
+    """Log the user in and finish the bookkeeping around it
+
+    Stamps last_login and transparently migrates hashes made with an
+    older method (upgrade_password_hash); both ride a single commit.
+    """
+    login_user(user, remember=remember)
+    user.last_login = datetime.utcnow()
+    user.upgrade_password_hash(password)
+    db.session.commit()
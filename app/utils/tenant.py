@@ -39,26 +39,44 @@ def get_subdomain_from_request():
 
 def get_current_tenant():
     """Get the current tenant based on subdomain"""
-    # Check thread-local storage first
-    if hasattr(_local, 'tenant'):
-        return _local.tenant
-    
-    # Check Flask's g object
+    # Check Flask's g object first: it is request-scoped, so the session-
+    # bound instance loaded for this request is always preferred over the
+    # thread-local copy (which may be left over from a previous request)
     if hasattr(g, 'current_tenant'):
         return g.current_tenant
+
+    # Fall back to thread-local storage (set via set_current_tenant)
+    if hasattr(_local, 'tenant'):
+        return _local.tenant
     
     subdomain = get_subdomain_from_request()
     if not subdomain:
         return None
-    
+
     # Import here to avoid circular imports
+    from app import cache, db
     from app.models.tenant import Tenant
-    tenant = Tenant.query.filter_by(subdomain=subdomain, is_active=True).first()
-    
+
+    # Subdomain -> id mapping is cached so cold requests resolve the
+    # tenant with a PK get (identity-map friendly) instead of a filtered
+    # scan; a stale mapping falls through to the query below
+    tenant = None
+    tenant_id = cache.get(f'tenant_id:{subdomain}')
+    if tenant_id is not None:
+        tenant = db.session.get(Tenant, tenant_id)
+        if tenant is not None and (tenant.subdomain != subdomain
+                                   or not tenant.is_active):
+            tenant = None
+
+    if tenant is None:
+        tenant = Tenant.query.filter_by(subdomain=subdomain, is_active=True).first()
+        if tenant is not None:
+            cache.set(f'tenant_id:{subdomain}', tenant.id, timeout=300)
+
     # Cache in both thread-local and g
     _local.tenant = tenant
     g.current_tenant = tenant
-    
+
     return tenant
 
 def set_current_tenant(tenant):
@@ -4,6 +4,35 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _engine_options(uri):
+    """Engine options tuned for the dialect behind uri
+
+    Config subclasses that override SQLALCHEMY_DATABASE_URI must
+    rebuild their options from their own URI — TestingConfig runs on
+    sqlite and would crash on the Postgres-only pool and connect_args
+    settings otherwise.
+    """
+    options = {
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+        # The per-tenant query mix easily exceeds the default 500-entry
+        # compiled-statement cache; evictions mean recompiling hot SQL
+        'query_cache_size': 1200,
+    }
+    # SQLite doesn't use a sized QueuePool; only tune the pool for real servers
+    if not uri.startswith('sqlite'):
+        options.update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            # Cap runaway queries server-side so one bad scan can't hold
+            # a pooled connection indefinitely
+            'connect_args': {
+                'options': '-c statement_timeout='
+                           f"{int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 5000))}",
+            },
+        })
+    return options
+
 class Config:
     """Base configuration class"""
     
@@ -16,16 +45,15 @@ class Config:
         'sqlite:///multisutra_cms.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-    }
-    
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+
     # File Upload Configuration
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or \
         os.path.join(os.path.abspath(os.path.dirname(__file__)), 'static', 'uploads')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
-    ALLOWED_EXTENSIONS = set(os.environ.get('ALLOWED_EXTENSIONS', 
+    # frozenset: O(1) membership on the per-upload extension check
+    ALLOWED_EXTENSIONS = frozenset(
+        ext.strip().lower() for ext in os.environ.get('ALLOWED_EXTENSIONS',
                             'png,jpg,jpeg,gif,pdf,doc,docx,mp4,mov').split(','))
     
     # Email Configuration
@@ -39,12 +67,17 @@ class Config:
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
     
     # Cache Configuration
-    CACHE_TYPE = 'redis' if os.environ.get('REDIS_URL') else 'simple'
+    CACHE_TYPE = 'RedisCache' if os.environ.get('REDIS_URL') else 'SimpleCache'
     CACHE_REDIS_URL = os.environ.get('REDIS_URL')
     CACHE_DEFAULT_TIMEOUT = 300
     
     # Rate Limiting
     RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL') or 'redis://localhost:6379/1'
+
+    # Response compression (Flask-Compress); brotli preferred, gzip fallback
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_BR_LEVEL = 4
+    COMPRESS_MIN_SIZE = 500
     
     # AWS S3 Configuration
     AWS_ACCESS_KEY_ID = os.environ.get('AWS_ACCESS_KEY_ID')
@@ -62,11 +95,27 @@ class Config:
     
     # Security
     BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    # scrypt runs in OpenSSL's native code and is memory-hard, so a
+    # login verify costs a fraction of the 600k-round PBKDF2 loop for
+    # equivalent security; old pbkdf2 hashes upgrade on next login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
     WTF_CSRF_TIME_LIMIT = None
     
     # Session Configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     
+    # Blueprints to register (comma-separated env override; empty = all).
+    # Lets role-specific workers skip importing modules they never serve.
+    ENABLED_BLUEPRINTS = [
+        name.strip() for name in os.environ.get('ENABLED_BLUEPRINTS', '').split(',')
+        if name.strip()
+    ] or None
+
+    # When true, list views append raiseload('*') after their explicit
+    # loader options so any relationship the templates touch that we
+    # forgot to eager-load raises instead of silently issuing a query
+    STRICT_LOADING = os.environ.get('STRICT_LOADING', '').lower() == 'true'
+
     # Pagination
     POSTS_PER_PAGE = 10
     ADMIN_POSTS_PER_PAGE = 20
@@ -83,12 +132,29 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     WTF_CSRF_ENABLED = False
-    
+
+    @classmethod
+    def init_app(cls, app):
+        Config.init_app(app)
+
+        # Catch lazy-load (N+1) explosions during development (optional)
+        try:
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+            app.config.setdefault('NPLUSONE_RAISE', True)
+            NPlusOne(app)
+        except ImportError:
+            print("Warning: nplusone not installed, skipping N+1 query detection")
+
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
     WTF_CSRF_ENABLED = False
+    # Keep hashing cheap for fixtures; production cost is irrelevant in tests
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    # Fail fast on residual lazy loads so N+1 regressions break tests
+    STRICT_LOADING = True
 
 class ProductionConfig(Config):
     """Production configuration"""